@@ -0,0 +1,280 @@
+import argparse
+import importlib
+import inspect
+import json
+import logging
+import math
+import os
+import pathlib
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+####################
+# CONFIGURATION
+####################
+
+# Benchmarks parse_html, extract_events and every extract_* helper of a scraper
+# version against the saved html snapshots, fully offline.
+#
+#   python debugging_scripts/benchmark.py --versions 4 5 6 --repeat 5
+#   python debugging_scripts/benchmark.py --parsers html.parser lxml html5lib selectolax
+#   python debugging_scripts/benchmark.py --browser   (needs chrome, soup vs in-browser extraction)
+#
+# Run it from the project root so the scrapers write their logs to logs/.
+
+ROOT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_FOLDER = os.path.join(ROOT_FOLDER, 'logs')
+RESULTS_FOLDER = os.path.join(ROOT_FOLDER, 'logs', 'benchmarks')
+
+if ROOT_FOLDER not in sys.path:
+    sys.path.insert(0, ROOT_FOLDER)
+
+# helpers that aren't per-item extractors
+SKIPPED_HELPERS = {'extract_events', 'extract_shadow_events', 'extract_shadow_content', 'extract_browser_rows', 'extract_json_events'}
+
+
+####################
+# MEASUREMENT
+####################
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = max(0, math.ceil(fraction * len(ordered)) - 1)
+    return ordered[index]
+
+def measure(func, repeat, reset=None):
+    # reset runs before every timed call, untimed (clears the scraper's date caches so
+    # each repeat pays for date parsing like a fresh run does)
+    timings = []
+    for _ in range(repeat):
+        if reset:
+            reset()
+        start_time = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start_time)
+
+    # separate pass for memory, tracemalloc slows everything down
+    if reset:
+        reset()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "min_ms": min(timings) * 1000,
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "peak_kib": peak / 1024,
+    }
+
+def find_items(parsed_content, config):
+    # same lookup extract_events does, so helpers run over the real items
+    content_list_tag, content_list_attrs = next(iter(config['content_list_class'].items()))
+    content_list = parsed_content.find(content_list_tag, **content_list_attrs) if content_list_attrs else parsed_content
+    if not content_list:
+        return []
+    item_tag, item_attrs = next(iter(config['item_attr'].items()))
+    return content_list.find_all(item_tag, **item_attrs) if item_attrs else content_list.find_all(item_tag)
+
+def helper_arguments(module, helper, item, config):
+    # older versions take different arguments, map them by name
+    arguments = []
+    for name in inspect.signature(helper).parameters:
+        if name == 'item':
+            arguments.append(item)
+        elif name == 'config':
+            arguments.append(config)
+        elif name == 'title_element':
+            title = module.extract_title(item, config)
+            arguments.append(title[1] if isinstance(title, tuple) else item)
+        elif name.endswith('_config'):
+            arguments.append(config.get(name[:-len('_config')], {}))
+        else:
+            arguments.append(None)
+    return arguments
+
+def run_helper(helper, argument_lists):
+    for arguments in argument_lists:
+        helper(*arguments)
+
+def cache_reset(module):
+    # the lru_cache'd helpers (parse_date_cached, json_date_and_time), older versions have none
+    caches = [member.cache_clear for _, member in inspect.getmembers(module)
+              if callable(getattr(member, 'cache_clear', None)) and getattr(member, '__module__', None) == module.__name__]
+
+    def reset():
+        for cache_clear in caches:
+            cache_clear()
+    return reset if caches else None
+
+def record_stage(results, site_name, stage, func, repeat, items=None, reset=None):
+    try:
+        result = measure(func, repeat, reset)
+    except Exception as e:
+        result = {"error": f"{type(e).__name__}: {e}"}
+    result.update({"site": site_name, "stage": stage, "items": items})
+    if items and result.get("median_ms"):
+        result["items_per_second"] = items / (result["median_ms"] / 1000)
+    results.append(result)
+    return result
+
+
+####################
+# BENCHMARK
+####################
+
+def parse_with(module, html_content, config):
+    if 'config' in inspect.signature(module.parse_html).parameters:
+        return module.parse_html(html_content, config)
+    return module.parse_html(html_content)
+
+def benchmark_site(module, site_name, config, html_content, repeat, parsers=None):
+    results = []
+
+    reset = cache_reset(module)
+
+    def record(stage, func, items=None):
+        return record_stage(results, site_name, stage, func, repeat, items, reset)
+
+    record("parse_html", lambda: parse_with(module, html_content, config))
+
+    # compare backends when the version has a pluggable parser
+    if parsers and hasattr(module, 'PARSER_BACKEND'):
+        default_backend = module.PARSER_BACKEND
+        for backend in parsers:
+            module.PARSER_BACKEND = backend
+            parsed = parse_with(module, html_content, config)
+            events = module.extract_events(parsed, config)
+            record(f"parse_html[{backend}]", lambda: parse_with(module, html_content, config), len(events))
+        module.PARSER_BACKEND = default_backend
+
+    parsed_content = parse_with(module, html_content, config)
+    items = find_items(parsed_content, config)
+    record("extract_events", lambda: module.extract_events(parsed_content, config), len(items))
+
+    for name, helper in inspect.getmembers(module, inspect.isfunction):
+        if not name.startswith('extract_') or name in SKIPPED_HELPERS or helper.__module__ != module.__name__:
+            continue
+        try:
+            argument_lists = [helper_arguments(module, helper, item, config) for item in items]
+        except Exception as e:
+            results.append({"site": site_name, "stage": name, "items": len(items), "error": f"{type(e).__name__}: {e}"})
+            continue
+        record(name, lambda: run_helper(helper, argument_lists), len(items))
+
+    return results
+
+def benchmark_version(version, fixture_folder, repeat, parsers=None):
+    module = importlib.import_module(f"event_scraper{version}")
+    results = []
+    for site_name, config in module.SITES.items():
+        file_name = os.path.join(fixture_folder, f"{site_name}.html")
+        if not os.path.exists(file_name):
+            print(f"  {site_name}: no fixture, skipped")
+            continue
+        with open(file_name, 'r', encoding='utf-8') as f:
+            html_content = f.read()
+        print(f"  {site_name} ({len(html_content) / 1024:.0f} KiB)")
+        results.extend(benchmark_site(module, site_name, config, html_content, repeat, parsers))
+    return results
+
+def benchmark_browser(version, fixture_folder, repeat):
+    # loads each snapshot into a real chrome and times both engines on the same live page:
+    # page_source + parse_html + extract_events against EXTRACT_ITEMS_SCRIPT + extract_row
+    module = importlib.import_module(f"event_scraper{version}")
+    if not hasattr(module, 'EXTRACT_ITEMS_SCRIPT'):
+        print(f"  event_scraper{version} has no browser engine")
+        return []
+    results = []
+    with module.BrowserSession(module.build_chrome_options()) as session:
+        driver = session.driver
+        for site_name, config in module.SITES.items():
+            file_name = os.path.join(fixture_folder, f"{site_name}.html")
+            if not os.path.exists(file_name):
+                print(f"  {site_name}: no fixture, skipped")
+                continue
+            extractor = module.get_extractor(config, site_name)
+            if extractor.browser_spec is None:
+                results.append({"site": site_name, "stage": "browser engine", "items": None, "error": extractor.browser_unsupported})
+                continue
+            print(f"  {site_name}")
+            driver.get(pathlib.Path(file_name).as_uri())
+
+            def soup_engine():
+                return module.extract_events(module.parse_html(driver.page_source, config), config)
+
+            def browser_engine():
+                rows = driver.execute_script(module.EXTRACT_ITEMS_SCRIPT, extractor.browser_spec) or []
+                return module.extract_browser_rows(rows, config)
+
+            soup_events = soup_engine()
+            browser_events = browser_engine()
+            if soup_events != browser_events:
+                print(f"  {site_name}: engines disagree ({len(soup_events)} vs {len(browser_events)} events)")
+            reset = cache_reset(module)
+            record_stage(results, site_name, "soup (page_source)", soup_engine, repeat, len(soup_events), reset)
+            record_stage(results, site_name, "browser (script)", browser_engine, repeat, len(browser_events), reset)
+    return results
+
+def print_results(version, results):
+    print(f"\nevent_scraper{version}")
+    print(f"{'site':<22} {'stage':<24} {'items':>5} {'min ms':>9} {'median ms':>10} {'p95 ms':>9} {'peak KiB':>10} {'items/s':>9}")
+    for result in results:
+        items = result['items'] if result['items'] is not None else ''
+        if 'error' in result:
+            print(f"{result['site']:<22} {result['stage']:<24} {items:>5} {result['error']}")
+            continue
+        items_per_second = f"{result['items_per_second']:.0f}" if 'items_per_second' in result else ''
+        print(f"{result['site']:<22} {result['stage']:<24} {items:>5} {result['min_ms']:>9.2f} "
+              f"{result['median_ms']:>10.2f} {result['p95_ms']:>9.2f} {result['peak_kib']:>10.0f} {items_per_second:>9}")
+
+def save_results(version, results, fixture_folder, repeat, output_folder):
+    os.makedirs(output_folder, exist_ok=True)
+    file_name = os.path.join(output_folder, f"event_scraper{version}.json")
+    with open(file_name, 'w', encoding='utf-8') as f:
+        json.dump({
+            "version": version,
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "python": platform.python_version(),
+            "fixtures": fixture_folder,
+            "repeat": repeat,
+            "results": results,
+        }, f, indent=2)
+    return file_name
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Offline benchmark of the parse/extract pipeline")
+    arg_parser.add_argument("--versions", nargs="+", default=["6"], help="scraper versions to run, e.g. 2 3 4 5 6")
+    arg_parser.add_argument("--fixtures", default=FIXTURE_FOLDER, help="folder with <site>.html snapshots")
+    arg_parser.add_argument("--repeat", type=int, default=5)
+    arg_parser.add_argument("--output", default=RESULTS_FOLDER, help="folder for the json results")
+    arg_parser.add_argument("--parsers", nargs="+", help="parser backends to compare, items column is events extracted with each")
+    arg_parser.add_argument("--no-logging", action="store_true", help="disable the scrapers' logging to time extraction on its own")
+    arg_parser.add_argument("--browser", action="store_true", help="compare the BeautifulSoup and in-browser extraction engines in chrome")
+    args = arg_parser.parse_args(argv)
+
+    if args.no_logging:
+        logging.disable(logging.CRITICAL)
+
+    for version in args.versions:
+        if args.browser:
+            print(f"Benchmarking event_scraper{version} extraction engines in the browser")
+            results = benchmark_browser(version, args.fixtures, args.repeat)
+            print_results(version, results)
+            file_name = save_results(f"{version}_browser", results, args.fixtures, args.repeat, args.output)
+            print(f"Results written to {file_name}")
+            continue
+        print(f"Benchmarking event_scraper{version}")
+        results = benchmark_version(version, args.fixtures, args.repeat, args.parsers)
+        print_results(version, results)
+        file_name = save_results(version, results, args.fixtures, args.repeat, args.output)
+        print(f"Results written to {file_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import argparse
+import copy
+import json
+import os
+import sys
+from datetime import date
+
+####################
+# CONFIGURATION
+####################
+
+# Runs the platform adapters against fixture responses instead of the network and
+# checks the events they map to, fully offline.
+#
+#   python debugging_scripts/check_platform_adapters.py
+#   python debugging_scripts/check_platform_adapters.py --adapters tribe_events webflow
+#
+# fixtures/platforms/<adapter>.json holds the site, its "platform" block, the http
+# responses in the order the adapter asks for them and the events expected out.
+# These are small payloads in each platform's documented response shape built from
+# events in the logs/ snapshots, not captures of the live apis, so passing here only
+# means the adapters agree with the docs: none of tribe_events, simpleview or webflow
+# has been run against a live api yet. Timestamps follow what the platforms store
+# (webflow DateTime fields are UTC). Once a site runs with "fetch_mode": "platform",
+# replace its fixture with what it saved to logs/<site>.json.
+# json_ld has no fixture of its own, it's checked against the html extraction of
+# the same snapshot.
+
+ROOT_FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURE_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'platforms')
+SNAPSHOT_FOLDER = os.path.join(ROOT_FOLDER, 'logs')
+JSON_LD_SITE = 'Chatt Library'
+REFERENCE_DATE = date(2024, 8, 19)  # when the fixtures and snapshots were taken
+
+if ROOT_FOLDER not in sys.path:
+    sys.path.insert(0, ROOT_FOLDER)
+
+import event_scraper6 as scraper
+
+
+####################
+# FIXTURE SESSION
+####################
+
+class FixtureResponse:
+    def __init__(self, recorded):
+        self.recorded = recorded
+        self.text = recorded['text'] if 'text' in recorded else json.dumps(recorded['json'])
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.recorded['json']
+
+class FixtureSession:
+    # stands in for get_http_session(), hands out the responses in order and checks what was asked for
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.problems = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        if not self.responses:
+            raise scraper.requests.ConnectionError(f"no fixture response left for {url}")
+        recorded = self.responses.pop(0)
+        if url != recorded['url']:
+            self.problems.append(f"asked for {url}, fixture has {recorded['url']}")
+        if 'params' in recorded and params != recorded['params']:
+            self.problems.append(f"{url} with params {params}, fixture has {recorded['params']}")
+        return FixtureResponse(recorded)
+
+
+####################
+# CHECKS
+####################
+
+def site_config(fixture, platform_config=None):
+    # a fresh dict so get_extractor compiles it with the fixture's platform block
+    config = copy.deepcopy(scraper.SITES[fixture['site']])
+    config.update({'fetch_mode': "platform", 'platform': platform_config or fixture['platform']})
+    return config
+
+def compare_events(events, expected):
+    problems = []
+    if len(events) != len(expected):
+        problems.append(f"{len(events)} events, expected {len(expected)}")
+    for index, (event, expected_event) in enumerate(zip(events, expected)):
+        for field in scraper.EVENT_FIELDS:
+            if event.get(field) != expected_event.get(field):
+                problems.append(f"event {index} {field}: {event.get(field)!r}, expected {expected_event.get(field)!r}")
+    return problems
+
+def run_adapter(fixture, config):
+    session = FixtureSession(fixture['responses'])
+    scraper.get_http_session = lambda: session
+    payload = scraper.fetch_platform(fixture['site'], config)
+    return payload, session
+
+def check_fixture(adapter, fixture):
+    if adapter == "webflow":
+        os.environ.setdefault(fixture['platform'].get('token_env', 'WEBFLOW_API_TOKEN'), "fixture-token")
+    config = site_config(fixture)
+    payload, session = run_adapter(fixture, config)
+    if payload is None:
+        return ["fetch_platform returned None"] + session.problems
+    problems = session.problems + [f"{len(session.responses)} fixture responses never requested"] * bool(session.responses)
+    return problems + compare_events(scraper.extract_json_events(payload, config), fixture['expected'])
+
+def check_fallback(adapter, fixture):
+    # field paths that don't match the feed must hand the site back to its html path
+    platform_config = {**fixture['platform'], 'fields': {'title': "no.such.field", 'date': "no.such.field"}}
+    payload, _ = run_adapter(fixture, site_config(fixture, platform_config))
+    return [] if payload is None else ["an unmappable feed wasn't rejected"]
+
+def check_json_ld():
+    with open(os.path.join(SNAPSHOT_FOLDER, f"{JSON_LD_SITE}.html"), 'r', encoding='utf-8') as f:
+        html_content = f.read()
+    html_config = scraper.SITES[JSON_LD_SITE]
+    html_events = scraper.extract_events(scraper.parse_html(html_content, html_config), html_config)
+    config = site_config({'site': JSON_LD_SITE}, {'adapter': "json_ld"})
+    events = scraper.extract_json_events(scraper.JsonPayload({"events": scraper.json_ld_events(html_content)}), config)
+    # json-ld carries the full description where the list view has an excerpt, and typographic quotes
+    expected = [{**event, 'details': json_event['details'], 'location': json_event['location']}
+                for event, json_event in zip(html_events, events)]
+    problems = compare_events(events, expected)
+    if not events:
+        problems.append("no events found in the json-ld")
+    return problems
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Check the platform adapters against fixture responses, offline")
+    arg_parser.add_argument("--adapters", nargs="+", default=sorted(scraper.PLATFORM_ADAPTERS), help="adapters to check")
+    args = arg_parser.parse_args(argv)
+
+    scraper.REFERENCE_DATE = REFERENCE_DATE
+    get_http_session = scraper.get_http_session
+    failed = False
+    try:
+        for adapter in args.adapters:
+            if adapter == "json_ld":
+                results = {"snapshot": check_json_ld()}
+            else:
+                with open(os.path.join(FIXTURE_FOLDER, f"{adapter}.json"), 'r', encoding='utf-8') as f:
+                    fixture = json.load(f)
+                results = {"fixture": check_fixture(adapter, fixture), "fallback": check_fallback(adapter, fixture)}
+            for check, problems in results.items():
+                print(f"{adapter:<14} {check:<10} {'ok' if not problems else 'FAILED'}")
+                for problem in problems:
+                    print(f"    {problem}")
+                failed = failed or bool(problems)
+    finally:
+        scraper.get_http_session = get_http_session
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,49 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import SessionNotCreatedException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
-import chromedriver_autoinstaller
-from bs4 import BeautifulSoup
-from datetime import datetime
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+from bs4.builder import builder_registry
+from datetime import datetime, date, timedelta
 from dateutil import parser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from collections import Counter
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib.parse import quote
+from zoneinfo import ZoneInfo
+import requests
 import pandas as pd
+import threading
+import queue
 import time
 import re
 import logging
+import argparse
+import json
+import hashlib
+import inspect
+import html
+import difflib
 import csv
+import shutil
+import sqlite3
 import os
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
 ####################
 # CONFIGURATION
 ####################
@@ -22,6 +52,7 @@ import os
 
 LOG_FOLDER = 'logs'
 DATA_FOLDER = 'data'
+DRIVER_CACHE_FILE = os.path.join(DATA_FOLDER, '.chromedriver_path')
 
 if not os.path.exists(LOG_FOLDER):
     os.makedirs(LOG_FOLDER)
@@ -42,6 +73,71 @@ execute_scroll_page = True
 execute_save_html =True
 execute_save_events_to_csv = False
 
+# FETCH SETTINGS
+execute_parallel_fetch = True
+execute_headless = True
+MAX_CONCURRENT_BROWSERS = 3  # upper bound on chrome instances running at once
+DEFAULT_WAIT_TIMEOUT = 15  # seconds, sites can override with "wait_timeout"
+WAIT_POLL_INTERVAL = 0.25
+WAIT_STABLE_POLLS = 2  # item count has to hold this many polls in a row
+
+DEFAULT_FETCH_MODE = "browser"  # "browser", "http" or "auto" (http first, browser if content_list_class is missing), sites can override with "fetch_mode"
+                                # "json" reads the site's "json_endpoint" instead of rendering, the html config is the fallback
+                                # "platform" uses the site's "platform" adapter (tribe_events, simpleview, webflow, json_ld)
+                                # when json/platform fail the site falls back to its "fallback_fetch_mode" (default "browser")
+PLATFORM_MAX_PAGES = 10  # page limit when following a platform api's pagination
+execute_capture_network = False  # record xhr/fetch responses next to the html snapshot and flag event feeds (--capture-network)
+DEFAULT_EXTRACT_ENGINE = "soup"  # "soup" (BeautifulSoup over the fetched html) or "browser" (extract in the page with one script), sites can override with "extract_engine"
+DEFAULT_FETCH_SCOPE = "content_list"  # browser: "content_list" (just that element's outerHTML, page_source if it isn't found) or "page", sites can override with "fetch_scope"
+HTTP_TIMEOUT = 20
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# TRACE SETTINGS
+execute_trace = False  # per-item trace records in TRACE_FILE, off by default (--trace), costs one bool check per item when off
+TRACE_FILE = os.path.join(LOG_FOLDER, 'trace.jsonl')
+TRACE_TEXT_LIMIT = 120
+
+# PARSER SETTINGS
+PARSER_BACKEND = "lxml"  # "html.parser", "lxml", "html5lib" or "selectolax", sites can override with "parser"
+execute_partial_parse = True  # only build the content_list_class subtree, sites can opt out with "partial_parse": False
+
+# DATE SETTINGS
+DATE_CACHE_SIZE = 4096  # (parse_method, formats, date_text) -> (date, time), shared by all sites
+REFERENCE_DATE = None  # "today" for filling in missing years, None means date.today() (--reference-date)
+YEAR_ROLLOVER_DAYS = 180  # a month/day more than this many days ago is taken to be next year
+LOCAL_TIMEZONE = ZoneInfo("America/New_York")  # feed timestamps with an offset (UTC "Z" mostly) are shown in local time
+
+# INCREMENTAL SETTINGS
+execute_incremental = True  # reuse events already seen in earlier runs instead of re-extracting them (live runs only, --full to skip)
+SEEN_EVENTS_FILE = os.path.join(DATA_FOLDER, 'seen_events.json')
+DELTA_EVENTS_FILE = os.path.join(DATA_FOLDER, 'delta_events.csv')
+SEEN_EVENTS_MAX_AGE_DAYS = 30  # drop index entries that haven't shown up for this long
+EXTRACTOR_VERSION = 2  # bump when extraction or date parsing changes so stored events get extracted again
+execute_page_cache = True  # reuse last run's events when a site's page or content list hasn't changed (live runs only)
+PAGE_CACHE_FILE = os.path.join(DATA_FOLDER, 'page_cache.json')
+
+# SCROLL SETTINGS
+DEFAULT_SCROLL_STRATEGY = "adaptive"  # "none", "fixed" or "adaptive", sites can override with "scroll_strategy"
+SCROLL_IDLE_ROUNDS = 3  # adaptive: stop after this many rounds at the bottom with nothing new, override with "scroll_idle_rounds"
+SCROLL_ROUND_TIMEOUT = 1.0  # adaptive: how long to wait for new content once at the bottom
+SCROLL_MAX_ROUNDS = 200
+
+# OUTPUT SETTINGS
+execute_stream_output = True  # write each site's rows as soon as it's extracted instead of holding every event for one DataFrame
+ALL_EVENTS_FILE = "all_events.csv"
+execute_save_parquet = True  # typed copy of all_events for the dashboards, needs pyarrow
+PARQUET_FOLDER = os.path.join(DATA_FOLDER, 'events_parquet')  # hive layout: source=<site>/month=<YYYY-MM>/*.parquet
+execute_save_sqlite = True  # upsert every run into one database that keeps history, see query_events
+EVENTS_DB_FILE = os.path.join(DATA_FOLDER, 'events.db')
+
+# DEDUPE SETTINGS
+execute_dedupe = True  # merge the same event listed by several sites into all_events_deduped.csv
+DEDUPED_EVENTS_FILE = "all_events_deduped.csv"
+DEDUPE_TITLE_THRESHOLD = 0.85  # title similarity (0-1) needed to merge two events on the same date and location
 
 
 
@@ -51,6 +147,8 @@ SITES = {
  
     "Visit Chattanooga": {
         "url": "https://www.visitchattanooga.com/events/",
+        # simpleview site, "fetch_mode": "platform" reads rest_v2 instead of rendering
+        "platform": {"adapter": "simpleview", "base_url": "https://www.visitchattanooga.com"},
         "content_list_class": {"div": {"class": "content grid"}},
         "item_attr": {"div": {"data-type": "events"}},
         "title": {"a": {"class": "title truncate"}},
@@ -64,6 +162,7 @@ SITES = {
         "date": {
             "extract_method": "attrs",
             "parse_method": "parser.parse",
+            "formats": ["%b %d"],  # Aug 19
             "tag": "span",
             "attrs": {"class": "mini-date-container"}
             }, 
@@ -81,6 +180,9 @@ SITES = {
 
     "CHA Guide Events": {
         "url": "https://www.cha.guide/events",
+        # webflow site, the cms api needs the site owner's token:
+        # "platform": {"adapter": "webflow", "collection_id": "...", "url_template": "https://www.cha.guide/events/{slug}",
+        #              "fields": {"date": "fieldData.date", "location": "fieldData.location"}},
         "content_list_class": {"div": {"class": "flex-table w-dyn-items"}},
         "item_attr": {"div": {"role": "listitem"}},
         "title": {"h3": {"class": "event-title"}},
@@ -93,6 +195,7 @@ SITES = {
         "date": {
             "extract_method": "attrs",
             "parse_method": "time_range",
+            "formats": [r"^\w{3},\s*(?P<month>[a-z]{3,9})\.? (?P<day>\d{1,2})\s*@\s*(?P<time>.*)$"],  # Fri,Aug 23@5:30-8:30pm
             "tag": "div",
             # "attrs": {"class": "event-date-div"}
             "attrs": {"class": "smaller-text bottom-margin---10px"}
@@ -122,6 +225,7 @@ SITES = {
         "date": {
             "extract_method": "tag",
             "parse_method": "split",
+            "formats": [r"^(?P<month>[a-z]{3,9})\.? (?P<day>\d{1,2}), (?P<year>\d{4})(?:\s+(?P<time>.*))?$"],  # Aug 19, 2024 7:00 PM - 9:00 PM
             "tag": {"p":{"class": "event-date"}}
             }, 
         
@@ -142,6 +246,10 @@ SITES = {
 
     'Chatt Library': {
         'url': 'https://chattlibrary.org/events/',
+        "fetch_mode": "auto",
+        # the events calendar site, "fetch_mode": "platform" reads the tribe api once it's been checked against a live run
+        "platform": {"adapter": "tribe_events", "base_url": "https://chattlibrary.org"},
+        "fallback_fetch_mode": "auto",
         "content_list_class": {"div": {"class": "tribe-events-calendar-list"}},
         "item_attr": {"div": {"class": "tribe-common-g-row tribe-events-calendar-list__event-row"}},
         "title": {"a": {"class": "tribe-events-calendar-list__event-title-link tribe-common-anchor-thin"}},
@@ -152,6 +260,7 @@ SITES = {
         "date": {
             "extract_method": "attrs",
             "parse_method": "split '@'",
+            "formats": ["%B %d @ %I:%M %p"],  # August 19 @ 11:00 AM
             "tag": {"span": {"class": "tribe-event-date-start"}},
             "attrs": {"class": "tribe-event-date-start"}
             # "tag": {"time": {"class": "tribe-events-calendar-list__event-date-tag-datetime', 'attribute': 'datetime"}}
@@ -257,20 +366,34 @@ SITES = {
 
     # "Times Free Press": {
     #     "url": "https://www.timesfreepress.com/tfpevents/?_evDiscoveryPath=/",
-    #     "shadow": True,
-    #     "shadow_selectors": ["shadow-host-selector", "nested-shadow-host-selector"],
-    #     "content_selector": "content-list-selector",
-    #     "title_selector": "h1.title",
-    #     "url_selector": "a.link",
-    #     "date_selector": "span.date",
-    #     "start_time_selector": "span.start",
-    #     "end_time_selector": "span.end",
-    #     "image_selector": "img.thumbnail",
-    #     "location_selector": "div.location",
-    #     "recurrence_selector": "span.recurrence",
-    #     "category_selector": "",
-    #     "details_selector": "",
-    #     "price_selector": "", 
+    #     "shadow": True,  # fetch the composed tree, shadow roots at any depth are inlined so no host selectors needed
+    #     # placeholders until the selectors are worked out (check_shadow_dom lists the hosts)
+    #     "content_list_class": {"div": {"class": "content-list"}},
+    #     "item_attr": {"div": {"class": "event"}},
+    #     "title": {"h1": {"class": "title"}},
+    #     "event_url": {
+    #         "parse_method": "tag",
+    #         "base_url": "https://www.timesfreepress.com",
+    #         "tag": "a",
+    #         "attrs": {"class": "link"}
+    #         },
+    #     "date": {
+    #         "extract_method": "attrs",
+    #         "parse_method": "parser.parse",
+    #         "tag": "span",
+    #         "attrs": {"class": "date"}
+    #         },
+    #     "img": {
+    #         "container": {"div": {"class": "thumbnail"}},
+    #         "tag": "img",
+    #         "attr": "src",
+    #         "parse_method": "none"
+    #     },
+    #     "location": {"div": {"class": "location"}},
+    #     "recurrence": {"span": {"class": "recurrence"}},
+    #     "category": {},
+    #     "details": {},
+    #     "price": {},
     # },
 
 }
@@ -279,24 +402,431 @@ SITES = {
 # FETCHING & PARSING
 ####################
 
-def fetch_page(url):
-    chromedriver_autoinstaller.install()
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome()
-    
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+def resolve_driver_path(stale_path=None):
+    # resolve chromedriver once per process and remember the path on disk so
+    # later runs don't hit the install helpers at all. stale_path is a driver that
+    # no longer matches chrome (chrome auto-updated), drop it and install again
+    global _driver_path
+    with _driver_path_lock:
+        if stale_path and _driver_path == stale_path:
+            logging.info(f"Chromedriver {stale_path} doesn't match chrome anymore, resolving it again")
+            _driver_path = None
+            if os.path.exists(DRIVER_CACHE_FILE):
+                os.remove(DRIVER_CACHE_FILE)
+        if _driver_path:
+            return _driver_path
+
+        if os.path.exists(DRIVER_CACHE_FILE):
+            with open(DRIVER_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cached_path = f.read().strip()
+            if cached_path and os.path.exists(cached_path):
+                logging.info(f"Using cached chromedriver: {cached_path}")
+                _driver_path = cached_path
+                return _driver_path
+
+        _driver_path = ChromeDriverManager().install()
+        with open(DRIVER_CACHE_FILE, 'w', encoding='utf-8') as f:
+            f.write(_driver_path)
+        logging.info(f"Resolved chromedriver: {_driver_path}")
+        return _driver_path
+
+
+def build_chrome_options():
+    options = Options()
+    if execute_headless:
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1920,1080')
+    if execute_capture_network:
+        # chromedriver only records Network.* events when performance logging is on
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    return options
+
+
+class BrowserSession:
+    # one Chrome instance for the whole run, each site gets a fresh tab
+    def __init__(self, options=None):
+        self.options = options
+        self.driver = None
+        self.home_handle = None
+        self.startup_seconds = None
+        self.site_seconds = {}
+        self.scroll_stats = {}
+        self.broken = False  # chrome died under us, the pool drops the session instead of reusing it
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        start_time = time.perf_counter()
+        driver_path = resolve_driver_path()
+        try:
+            self.driver = webdriver.Chrome(service=Service(driver_path), options=self.options or Options())
+        except SessionNotCreatedException:
+            # usually a cached driver left behind by a chrome update, retry once with a fresh one
+            driver_path = resolve_driver_path(stale_path=driver_path)
+            self.driver = webdriver.Chrome(service=Service(driver_path), options=self.options or Options())
+        self.home_handle = self.driver.current_window_handle
+        self.startup_seconds = time.perf_counter() - start_time
+        logging.info(f"Browser started in {self.startup_seconds:.2f}s")
+
+    def close(self):
+        if self.driver:
+            try:
+                self.driver.quit()
+            except WebDriverException as e:
+                logging.error(f"Error closing the browser: {e}")
+            self.driver = None
+
+    def alive(self):
+        try:
+            self.driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    def open_tab(self):
+        self.driver.switch_to.new_window('tab')
+        return self.driver
+
+    def close_tab(self):
+        if self.driver.current_window_handle != self.home_handle:
+            self.driver.close()
+        self.driver.switch_to.window(self.home_handle)
+
+
+class BrowserPool:
+    # hands out up to `size` BrowserSessions to fetch threads, starting them on demand
+    def __init__(self, size, options=None):
+        self.size = size
+        self.options = options
+        self.sessions = []
+        self.available = queue.Queue()
+        self.lock = threading.Lock()
+        self.http_seconds = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for session in self.sessions:
+            session.close()
+
+    def acquire(self):
+        # a None on the queue is a slot freed by a session that failed to start,
+        # whoever picks it up tries to start a browser of their own
+        while True:
+            full = False
+            with self.lock:
+                try:
+                    session = self.available.get_nowait()
+                except queue.Empty:
+                    if len(self.sessions) < self.size:
+                        session = BrowserSession(self.options)
+                        self.sessions.append(session)
+                        break
+                    full = True
+            if full:
+                session = self.available.get()
+            if session is not None:
+                return session
+
+        # start outside the lock so several browsers can boot at the same time
+        try:
+            session.start()
+        except Exception:
+            self.discard(session)
+            raise
+        return session
+
+    def discard(self, session):
+        # free the slot for a fresh browser, the next acquirer starts one
+        session.close()
+        with self.lock:
+            self.sessions.remove(session)
+        self.available.put(None)
+
+    @contextmanager
+    def session(self):
+        session = self.acquire()
+        try:
+            yield session
+        finally:
+            if session.broken:
+                logging.info("Dropping a crashed browser from the pool")
+                self.discard(session)
+            else:
+                self.available.put(session)
+
+
+CSS_IDENTIFIER = re.compile(r'^-?[A-Za-z_][A-Za-z0-9_-]*$')
+
+def config_to_css_selector(selector_config):
+    # {"div": {"class": "content grid"}} -> 'div.content.grid'
+    tag, attrs = next(iter(selector_config.items()), (None, None))
+    if not tag:
+        return None
+
+    selector = tag
+    for attr, value in (attrs or {}).items():
+        if attr == 'class' and isinstance(value, str):
+            for class_name in value.split():
+                selector += f'.{class_name}' if CSS_IDENTIFIER.match(class_name) else f'[class~="{class_name}"]'
+        elif attr == 'id' and isinstance(value, str) and CSS_IDENTIFIER.match(value):
+            selector += f'#{value}'
+        elif value is True:
+            selector += f'[{attr}]'
+        elif isinstance(value, str):
+            selector += f'[{attr}="{value}"]'
+        # callables (e.g. the pulse location lambda) have no css equivalent, the tag alone still works for waiting
+    return selector
+
+# querySelector stops at shadow roots, for "shadow" sites keep looking inside every open one
+DEEP_QUERY_JS = """
+    function deepQuery(root, selector, shadow) {
+        var found = root.querySelector(selector);
+        if (found || !shadow) { return found; }
+        var elements = root.querySelectorAll('*');
+        for (var i = 0; i < elements.length; i++) {
+            if (elements[i].shadowRoot) {
+                found = deepQuery(elements[i].shadowRoot, selector, shadow);
+                if (found) { return found; }
+            }
+        }
+        return null;
+    }
+"""
+
+COUNT_ITEMS_SCRIPT = DEEP_QUERY_JS + """
+    var container = arguments[0] ? deepQuery(document, arguments[0], arguments[2]) : document;
+    if (!container) { return 0; }
+    return arguments[1] ? container.querySelectorAll(arguments[1]).length : 1;
+"""
+
+def wait_for_content(driver, config):
+    # poll for the site's items and return as soon as their count stops growing
+    timeout = config.get('wait_timeout', DEFAULT_WAIT_TIMEOUT)
+    content_selector = config_to_css_selector(config.get('content_list_class', {}))
+    item_selector = config_to_css_selector(config.get('item_attr', {}))
+
+    start_time = time.perf_counter()
+    last_count = -1
+    stable_polls = 0
+    while time.perf_counter() - start_time < timeout:
+        count = driver.execute_script(COUNT_ITEMS_SCRIPT, content_selector, item_selector, bool(config.get('shadow')))
+        if count and count == last_count:
+            stable_polls += 1
+            if stable_polls >= WAIT_STABLE_POLLS:
+                logging.info(f"{count} items ready after {time.perf_counter() - start_time:.2f}s")
+                return count
+        else:
+            stable_polls = 0
+        last_count = count
+        time.sleep(WAIT_POLL_INTERVAL)
+
+    logging.warning(f"Timed out after {timeout}s waiting for {item_selector} in {content_selector} (found {last_count})")
+    return last_count
+
+
+def fetch_page(site_name, config, session):
+    url = config["url"]
+    start_time = time.perf_counter()
+    driver = session.open_tab()
+
     try:
+        if execute_capture_network:
+            driver.get_log('performance')  # drop whatever the previous site left in the buffer
         driver.get(url)
-        time.sleep(5)  # Wait for JavaScript to load content
+        wait_for_content(driver, config)  # Wait for JavaScript to load content
         if execute_scroll_page:
-            scroll_page(driver)  # Scroll the page to ensure all content is loaded
-        html_content = driver.page_source
-        return html_content, driver
+            session.scroll_stats[site_name] = scroll_page(driver, config)  # Scroll the page to ensure all content is loaded
+        if execute_capture_network:
+            capture_network_requests(site_name, driver)
+        if config.get('shadow'):
+            # one call for the whole flattened page, extract_events then runs on it like any other
+            return composed_html(site_name, driver)
+        if config.get('extract_engine', DEFAULT_EXTRACT_ENGINE) == "browser":
+            rows = browser_rows(site_name, config, driver)
+            if rows is not None:
+                return rows
+        return page_html(site_name, config, driver)
+    except WebDriverException as e:
+        logging.error(f"Error fetching the page: {e}")
+        # timeouts and the like leave chrome usable, a crash doesn't
+        session.broken = not session.alive()
+        return None
     except Exception as e:
         logging.error(f"Error fetching the page: {e}")
-        return None, driver
+        return None
     finally:
-        logging.info(f"{url} fetched")
-        driver.quit()
+        try:
+            session.close_tab()
+        except WebDriverException as e:
+            logging.error(f"Error closing the tab for {site_name}: {e}")
+            session.broken = True
+        session.site_seconds[site_name] = time.perf_counter() - start_time
+        logging.info(f"{url} fetched in {session.site_seconds[site_name]:.2f}s")
+
+
+CONTENT_LIST_HTML_SCRIPT = """
+    var container = document.querySelector(arguments[0]);
+    return container ? container.outerHTML : null;
+"""
+
+def css_selector_exact(selector_config):
+    # callables and lists get dropped by config_to_css_selector, so the css may match a different element
+    _, attrs = next(iter(selector_config.items()), (None, None))
+    return all(isinstance(value, str) or value is True for value in (attrs or {}).values())
+
+class ContentListHtml(str):
+    # what page_html hands back when only the content list was fetched, so it isn't mistaken for
+    # the full page (snapshots, grid_search / find_iframes)
+    pass
+
+def page_html(site_name, config, driver):
+    # everything outside content_list_class gets thrown away by parse_html anyway, so don't pull it over the wire
+    content_list_config = config['content_list_class']
+    _, content_list_attrs = next(iter(content_list_config.items()))
+    # no attrs means the whole page is the content list
+    if config.get('fetch_scope', DEFAULT_FETCH_SCOPE) == "content_list" and content_list_attrs:
+        html_content = driver.execute_script(CONTENT_LIST_HTML_SCRIPT, config_to_css_selector(content_list_config))
+        if html_content and (css_selector_exact(content_list_config) or content_list_present(html_content, config)):
+            logging.info(f"{site_name}: fetched the content list only ({len(html_content) / 1024:.0f} KiB)")
+            return ContentListHtml(html_content)
+        logging.info(f"{site_name}: content list not found by css, falling back to the full page source")
+    return driver.page_source
+
+
+COMPOSED_HTML_SCRIPT = """
+    // serialize the flat tree: open shadow roots are inlined in place of their host's children
+    // and slots are replaced by what's assigned to them, so selectors see what the page renders
+    var VOID = {area: 1, base: 1, br: 1, col: 1, embed: 1, hr: 1, img: 1, input: 1, link: 1, meta: 1, source: 1, track: 1, wbr: 1};
+    var SKIP = {script: 1, style: 1, noscript: 1, template: 1};
+    var out = [];
+    function escapeText(value) {
+        return value.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+    }
+    function escapeAttribute(value) {
+        return value.replace(/&/g, '&amp;').replace(/"/g, '&quot;');
+    }
+    function serializeChildren(nodes) {
+        for (var i = 0; i < nodes.length; i++) { serialize(nodes[i]); }
+    }
+    function serialize(node) {
+        if (node.nodeType === Node.TEXT_NODE) { out.push(escapeText(node.nodeValue)); return; }
+        if (node.nodeType !== Node.ELEMENT_NODE) { return; }
+        var name = node.localName;
+        if (SKIP[name]) { return; }
+        if (name === 'slot') {
+            var assigned = node.assignedNodes();
+            serializeChildren(assigned.length ? assigned : node.childNodes);
+            return;
+        }
+        out.push('<' + name);
+        for (var i = 0; i < node.attributes.length; i++) {
+            out.push(' ' + node.attributes[i].name + '="' + escapeAttribute(node.attributes[i].value) + '"');
+        }
+        out.push('>');
+        if (VOID[name]) { return; }
+        serializeChildren(node.shadowRoot ? node.shadowRoot.childNodes : node.childNodes);
+        out.push('</' + name + '>');
+    }
+    serialize(document.documentElement);
+    return '<!DOCTYPE html>' + out.join('');
+"""
+
+def composed_html(site_name, driver):
+    html_content = driver.execute_script(COMPOSED_HTML_SCRIPT)
+    logging.info(f"{site_name}: serialized the composed tree ({len(html_content) / 1024:.0f} KiB)")
+    return html_content
+
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    # one keep-alive connection pool shared by every http fetch in the process,
+    # requests asks for gzip/deflate (and br when brotli is installed) by default
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=len(SITES), pool_maxsize=MAX_CONCURRENT_BROWSERS, max_retries=2)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers.update(HTTP_HEADERS)
+            _http_session = session
+        return _http_session
+
+def fetch_page_http(site_name, config):
+    url = config["url"]
+    try:
+        response = get_http_session().get(url, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return response.text
+    except requests.RequestException as e:
+        logging.error(f"Error fetching {url} over http: {e}")
+        return None
+
+def content_list_present(html_content, config):
+    content_list_tag, _ = next(iter(config['content_list_class'].items()))
+    strainer = content_list_strainer(config)
+    return BeautifulSoup(html_content, soup_builder(), parse_only=strainer).find(content_list_tag) is not None
+
+
+def fetch_site(site_name, config, pool):
+    fetch_mode = config.get('fetch_mode', DEFAULT_FETCH_MODE)
+
+    if fetch_mode in ("json", "platform"):
+        start_time = time.perf_counter()
+        payload = fetch_json(site_name, config) if fetch_mode == "json" else fetch_platform(site_name, config)
+        pool.http_seconds[site_name] = time.perf_counter() - start_time
+        if payload is not None:
+            logging.info(f"{site_name}: {fetch_mode} feed fetched in {pool.http_seconds[site_name]:.2f}s")
+            return payload
+        fetch_mode = config.get('fallback_fetch_mode', "browser")
+        logging.info(f"{site_name}: {config.get('fetch_mode')} feed failed, falling back to {fetch_mode}")
+
+    if fetch_mode in ("http", "auto"):
+        start_time = time.perf_counter()
+        html_content = fetch_page_http(site_name, config)
+        pool.http_seconds[site_name] = time.perf_counter() - start_time
+        logging.info(f"{config['url']} fetched over http in {pool.http_seconds[site_name]:.2f}s")
+        if fetch_mode == "http":
+            return html_content
+        if html_content and content_list_present(html_content, config):
+            return html_content
+        logging.info(f"{site_name}: content list not in the static html, falling back to the browser")
+
+    with pool.session() as session:
+        return fetch_page(site_name, config, session)
+
+
+def log_session_timings(pool, wall_seconds):
+    logging.info("#" * 80)
+    site_seconds = {}
+    scroll_stats = {}
+    for site_name, seconds in pool.http_seconds.items():
+        site_seconds[f"{site_name} (http)"] = seconds
+    for session in pool.sessions:
+        if session.startup_seconds is not None:
+            logging.info(f"Browser startup: {session.startup_seconds:.2f}s")
+        site_seconds.update(session.site_seconds)
+        scroll_stats.update(session.scroll_stats)
+    for site_name, seconds in site_seconds.items():
+        logging.info(f"{site_name}: {seconds:.2f}s")
+        stats = scroll_stats.get(site_name)
+        if stats:
+            logging.info(f"    scroll ({stats['strategy']}): {stats['rounds']} rounds, {stats['items']} items, {stats['seconds']:.2f}s")
+    logging.info(f"Total fetch time: {sum(site_seconds.values()):.2f}s")
+    logging.info(f"Wall time: {wall_seconds:.2f}s")
+    logging.info("#" * 80)
 
 
 
@@ -323,26 +853,100 @@ def find_iframes(html_content):
         logging.info("No iframes found in HTML")
 
 
+SHADOW_HOSTS_SCRIPT = """
+    // every open shadow host, nested ones included, as plain data so it's one round trip
+    var hosts = [];
+    function visit(root, depth) {
+        var elements = root.querySelectorAll('*');
+        for (var i = 0; i < elements.length; i++) {
+            var shadowRoot = elements[i].shadowRoot;
+            if (shadowRoot) {
+                hosts.push([elements[i].localName, elements[i].id, depth, shadowRoot.querySelectorAll('*').length]);
+                visit(shadowRoot, depth + 1);
+            }
+        }
+    }
+    visit(document, 0);
+    return hosts;
+"""
+
 def check_shadow_dom(driver):
-    shadow_hosts = driver.execute_script("""
-        return Array.from(document.querySelectorAll('*')).filter(el => el.shadowRoot);
-    """)
-    for host in shadow_hosts:
-        logging.info(f"Found Shadow DOM host: {host.tag_name}, id: {host.get_attribute('id')}")
+    for tag_name, host_id, depth, elements in driver.execute_script(SHADOW_HOSTS_SCRIPT):
+        logging.info(f"Found Shadow DOM host: {tag_name}, id: {host_id}, depth {depth}, {elements} elements inside")
 
 def find_potential_containers(parsed_content):
     potential_containers = parsed_content.find_all('div', class_=lambda x: x and any(keyword in x.lower() for keyword in ['list', 'container', 'wrapper', 'events']))
     for container in potential_containers:
         logging.info(f"Potential container found: {container.get('class')}")
 
-def scroll_page(driver):
+PAGE_STATE_SCRIPT = DEEP_QUERY_JS + """
+    var container = arguments[0] ? deepQuery(document, arguments[0], arguments[2]) : document;
+    var count = container ? (arguments[1] ? container.querySelectorAll(arguments[1]).length : 1) : 0;
+    var height = document.body.scrollHeight;
+    var at_bottom = window.scrollY + window.innerHeight >= height - 2;
+    return [height, count, at_bottom];
+"""
+
+def scroll_page(driver, config):
+    strategy = config.get('scroll_strategy', DEFAULT_SCROLL_STRATEGY)
+    start_time = time.perf_counter()
+
+    if strategy == "none":
+        rounds, items = 0, None
+    elif strategy == "fixed":
+        rounds, items = scroll_page_fixed(driver, config)
+    else:
+        if strategy != "adaptive":
+            logging.warning(f"Unknown scroll_strategy {strategy!r}, using adaptive")
+            strategy = "adaptive"
+        rounds, items = scroll_page_adaptive(driver, config)
+
+    return {"strategy": strategy, "rounds": rounds, "items": items, "seconds": time.perf_counter() - start_time}
+
+def scroll_page_fixed(driver, config):
     total_height = driver.execute_script("return document.body.scrollHeight")
+    rounds = 0
     for i in range(1, total_height, 100):
         driver.execute_script(f"window.scrollTo(0, {i});")
-        time.sleep(0.1)
+        rounds += 1
+    # one readiness wait at the bottom instead of sleeping on every step
+    return rounds, wait_for_content(driver, config)
+
+def scroll_page_adaptive(driver, config):
+    # jump a viewport at a time, only wait once at the bottom, stop when nothing new loads
+    idle_limit = config.get('scroll_idle_rounds', SCROLL_IDLE_ROUNDS)
+    content_selector = config_to_css_selector(config.get('content_list_class', {}))
+    item_selector = config_to_css_selector(config.get('item_attr', {}))
+    shadow = bool(config.get('shadow'))
+
+    height, items, at_bottom = driver.execute_script(PAGE_STATE_SCRIPT, content_selector, item_selector, shadow)
+    rounds = 0
+    idle_rounds = 0
+    while idle_rounds < idle_limit and rounds < SCROLL_MAX_ROUNDS:
+        driver.execute_script("window.scrollBy(0, window.innerHeight);")
+        rounds += 1
+        new_height, new_items, at_bottom = driver.execute_script(PAGE_STATE_SCRIPT, content_selector, item_selector, shadow)
+
+        if at_bottom and new_height <= height and new_items <= items:
+            # give lazy loaders a moment to append more items
+            deadline = time.perf_counter() + SCROLL_ROUND_TIMEOUT
+            while time.perf_counter() < deadline and new_height <= height and new_items <= items:
+                time.sleep(WAIT_POLL_INTERVAL)
+                new_height, new_items, at_bottom = driver.execute_script(PAGE_STATE_SCRIPT, content_selector, item_selector, shadow)
+
+        if new_height > height or new_items > items:
+            idle_rounds = 0
+        elif at_bottom:
+            idle_rounds += 1
+        height, items = new_height, new_items
+
+    logging.info(f"Adaptive scroll: {rounds} rounds, {items} items, height {height}")
+    return rounds, items
 
 def save_html(html_content, site_name):
-    file_name = os.path.join(LOG_FOLDER, f"{site_name}.html")
+    # logs/<site>.html stays the full page (the replay / benchmark baseline), fragments get their own file
+    suffix = "_content_list" if isinstance(html_content, ContentListHtml) else ""
+    file_name = os.path.join(LOG_FOLDER, f"{site_name}{suffix}.html")
     with open(file_name, 'w', encoding='utf-8') as f:
         f.write(html_content)
 
@@ -351,412 +955,2009 @@ def save_parsed(parsed_content, site_name):
     with open(file_name, 'w', encoding='utf-8') as f:
         f.write(parsed_content.prettify())
 
+EVENT_TITLE_KEYS = {'title', 'name', 'event_name', 'eventname', 'headline'}
+EVENT_DATE_KEYS = {'start', 'start_date', 'startdate', 'start_time', 'starttime', 'date', 'event_date', 'datetime', 'dtstart', 'begin'}
+
+def looks_like_event(value):
+    if not isinstance(value, dict):
+        return False
+    keys = {key.lower() for key in value}
+    return bool(keys & EVENT_TITLE_KEYS) and bool(keys & EVENT_DATE_KEYS)
+
+def find_event_list(data, path="", depth=0):
+    # first list of event-shaped dicts in a json body -> (dotted path for "events_path", count)
+    if isinstance(data, list):
+        sample = data[:5]
+        if sample and sum(looks_like_event(value) for value in sample) * 2 > len(sample):
+            return path, len(data)
+        return None, 0
+    if isinstance(data, dict) and depth < 4:
+        for key, value in data.items():
+            found_path, count = find_event_list(value, f"{path}.{key}" if path else key, depth + 1)
+            if found_path is not None:
+                return found_path, count
+    return None, 0
+
 def capture_network_requests(site_name, driver):
-    network_file = os.path.join(DATA_FOLDER, f"{site_name}_network_request.txt")
-    network_logs = []
-    logs = driver.get_log('performance')
-    for entry in logs:
+    # xhr/fetch responses from the performance log, bodies pulled over CDP, saved next to the html snapshot
+    responses = {}
+    finished = set()
+    for entry in driver.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+        except (json.JSONDecodeError, KeyError):
+            continue
+        params = message.get('params', {})
+        if message.get('method') == 'Network.responseReceived' and params.get('type') in ('XHR', 'Fetch'):
+            response = params['response']
+            responses[params['requestId']] = {
+                "url": response['url'],
+                "status": response.get('status'),
+                "mime_type": response.get('mimeType'),
+                "type": params['type'],
+            }
+        elif message.get('method') == 'Network.loadingFinished':
+            finished.add(params.get('requestId'))
+
+    captured = []
+    for request_id, record in responses.items():
+        if request_id not in finished:
+            continue
+        try:
+            body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception as e:
+            record["error"] = str(e)
+            captured.append(record)
+            continue
+        if body.get('base64Encoded'):
+            captured.append(record)
+            continue
         try:
-            network_log = json.loads(entry['message'])['message']
-            if network_log['method'] in ['Network.response', 'Network.request', 'Network.webSocket']:
-                network_logs.append(network_log)
-        except json.JSONDecodeError:
-            print(f"Error parsing log: {entry['message']}")
-    with open(network_file, 'a', encoding='utf-8') as f:
-        for log in network_logs:
-            f.write(json.dumps(log) + '\n')
+            record["body"] = json.loads(body['body'])
+        except ValueError:
+            captured.append(record)
+            continue
+        record["events_path"], record["events"] = find_event_list(record["body"])
+        if record["events_path"] is not None:
+            logging.info(f"{site_name}: {record['url']} looks like an event feed, {record['events']} items at "
+                         f"events_path {record['events_path']!r} (candidate for fetch_mode \"json\")")
+        captured.append(record)
+
+    network_file = os.path.join(LOG_FOLDER, f"{site_name}_network.json")
+    with atomic_write(network_file) as f:
+        json.dump({"page": driver.current_url, "responses": captured}, f, indent=2)
+    logging.info(f"{site_name}: captured {len(captured)} xhr/fetch responses to {network_file}")
+    return captured
+
+@contextmanager
+def atomic_write(file_name):
+    # write to a temp file and rename it over the target, readers never see a half written file
+    temp_file = file_name + '.tmp'
+    try:
+        with open(temp_file, 'w', newline='', encoding='utf-8') as f:
+            yield f
+        os.replace(temp_file, file_name)
+    except BaseException:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
 
 def save_events_to_csv(events, site_name):
     file_name = os.path.join(DATA_FOLDER, f"{site_name}_events.csv")
-    with open(file_name, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = events[0].keys()
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+    with atomic_write(file_name) as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=EVENT_FIELDS, extrasaction='ignore')
 
         writer.writeheader()
         for event in events:
             writer.writerow(event)
 
 ####################
-# EXTRACTION 
+# PARSING 
 ####################
 
-def parse_html(html_content):
-    logging.info("#### HTML PARSED ####")
+def soup_builder(backend=None):
+    # fastest BeautifulSoup tree builder that's actually installed
+    backend = backend or PARSER_BACKEND
+    if backend != "selectolax" and builder_registry.lookup(backend):
+        return backend
+    return "lxml" if builder_registry.lookup("lxml") else "html.parser"
+
+def resolve_parser_backend(config=None):
+    backend = (config or {}).get('parser', PARSER_BACKEND)
+    if backend == "selectolax":
+        if LexborHTMLParser is not None:
+            return backend
+    elif builder_registry.lookup(backend):
+        return backend
+    fallback = soup_builder()
+    logging.warning(f"Parser backend {backend!r} isn't installed, using {fallback}")
+    return fallback
+
+def content_list_strainer(config):
+    # SoupStrainer for the site's content list, None when the config can't pin it down
+    content_list_tag, content_list_attrs = next(iter((config or {}).get('content_list_class', {}).items()), (None, None))
+    if not content_list_tag or not content_list_attrs or not all(content_list_attrs.values()):
+        return None
+    return SoupStrainer(content_list_tag, attrs=content_list_attrs)
+
+def parse_html(html_content, config=None):
+    backend = resolve_parser_backend(config)
+    logging.info(f"#### HTML PARSED ({backend}) ####")
     logging.info("#" * 80)
-    return BeautifulSoup(html_content, 'html.parser')
+    if backend == "selectolax":
+        return parse_html_selectolax(html_content, config)
+
+    # html5lib can't do parse_only, it always builds the full tree
+    if execute_partial_parse and backend != "html5lib" and (config or {}).get('partial_parse', True):
+        strainer = content_list_strainer(config)
+        if strainer is not None:
+            partial_content = BeautifulSoup(html_content, backend, parse_only=strainer)
+            if partial_content.contents:
+                return partial_content
+            logging.warning("Content list not found by the partial parse, parsing the full page")
+    return BeautifulSoup(html_content, backend)
+
+def parse_html_selectolax(html_content, config):
+    # lexbor parses the whole page, then only the content list is rebuilt as a
+    # BeautifulSoup tree so the extract_* helpers work on it unchanged
+    fragment = html_content
+    if content_list_strainer(config) is not None:
+        node = LexborHTMLParser(html_content).css_first(config_to_css_selector(config['content_list_class']))
+        if node is not None:
+            fragment = node.html
+    return BeautifulSoup(fragment, soup_builder())
 
-def extract_title(item, config):
-    title_tag, title_attrs = next(iter(config.get('title', {}).items()), (None, None))
-    logging.info(f"title_tag: {title_tag}")
-    logging.info(f"title_attrs: {title_attrs}")
+####################
+# TRACING
+####################
+
+# Per-item trace records go to their own file as one json object per line.
+# Callers check execute_trace before calling trace(), so with tracing off no
+# f-strings are built and no tags are stringified.
+
+trace_logger = logging.getLogger('trace')
+trace_logger.propagate = False
+
+def enable_trace(file_name=TRACE_FILE):
+    global execute_trace
+    handler = logging.FileHandler(file_name, mode='w', encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    trace_logger.addHandler(handler)
+    trace_logger.setLevel(logging.DEBUG)
+    execute_trace = True
+
+def trace_value(value):
+    # keep tags down to name, class and a bit of text instead of the whole subtree
+    if isinstance(value, Tag):
+        text = value.get_text(" ", strip=True)
+        return {"tag": value.name, "class": value.get('class'), "text": text[:TRACE_TEXT_LIMIT]}
+    if isinstance(value, str) and len(value) > TRACE_TEXT_LIMIT:
+        return value[:TRACE_TEXT_LIMIT] + "..."
+    return value
+
+def trace(site_name, stage, **fields):
+    record = {"site": site_name, "stage": stage}
+    for key, value in fields.items():
+        record[key] = trace_value(value)
+    trace_logger.debug(json.dumps(record, ensure_ascii=False, default=str))
+
+
+####################
+# COMPILED EXTRACTORS
+####################
+
+# Each SITES entry is compiled once into a SiteExtractor: selectors are resolved
+# to (tag, attrs) pairs and the parse_method branches are picked up front, so
+# extract_events only makes direct calls per item.
+
+def resolve_matcher(selector_config, field=None):
+    # {"div": {"class": "x"}} -> ("div", {"class": "x"})
+    tag, attrs = next(iter((selector_config or {}).items()), (None, None))
+    if tag and attrs is not None and not isinstance(attrs, dict):
+        raise ValueError(f"{field or 'selector'}: expected {{tag: {{attr: value}}}}, got {selector_config!r}")
+    return tag, attrs or {}
+
+def compile_title(title_config):
+    title_tag, title_attrs = resolve_matcher(title_config, 'title')
     if not title_tag:
-        return "N/A"
-    
-    title_element = item.find(title_tag, **title_attrs)
-    logging.info(f"title_element: {title_element}")
-    if not title_element:
-        return "N/A"
-    
-    a_tag = title_element.find('a') if title_element.name != 'a' else title_element
-    title = a_tag.text.strip() if a_tag else title_element.text.strip()
-    
-    return title, title_element
+        return lambda item: ("N/A", None)
 
-def extract_event_url(item, title_element, config):
+    def extract(item):
+        title_element = item.find(title_tag, title_attrs)
+        if not title_element:
+            return "N/A", None
 
-    url_config = config.get('event_url', {})
-    logging.info(f"url_config: {url_config}")
- 
-    base_url = url_config.get('base_url', '')  
-    logging.info(f"base_url: {base_url}")  
-    
+        a_tag = title_element.find('a') if title_element.name != 'a' else title_element
+        title = a_tag.text.strip() if a_tag else title_element.text.strip()
+        return title, title_element
+    return extract
+
+def compile_url_from_href(url_config):
+    # href (None when there was no element) -> event url, shared with the browser engine
+    base_url = url_config.get('base_url', '')
     parse_method = url_config.get('parse_method')
 
     if parse_method == "title":
+        return lambda href: base_url + href if href is not None else "N/A"
+    if parse_method == "tag":
+        return lambda href: (base_url + href if not href.startswith(('http://', 'https://')) else href) if href is not None else "N/A"
+    if parse_method is None:
+        return lambda href: None
+    raise ValueError(f"event_url: unknown parse_method {parse_method!r}")
 
-        href_element = title_element.get('href', '')
-        logging.info(f"href_element: {href_element}")
-
-        if href_element:
-            url = base_url + href_element 
-            logging.info(f"url: {url}")
-            logging.info("*" * 80)
-            return url
-        else:
-            a_tag = title_element.find('a')
-            logging.info(f"a_tag: {a_tag}")
-            href_element = a_tag.get('href', '') if a_tag else ''
-            logging.info(f"href_element: {href_element}")
-            url = base_url + href_element 
-            logging.info(f"url: {url}")
-            logging.info("*" * 80)
-            return url
+def compile_event_url(url_config):
+    url_from_href = compile_url_from_href(url_config)
+    parse_method = url_config.get('parse_method')
 
+    if parse_method == "title":
+        def extract(item, title_element):
+            if title_element is None:
+                return "N/A"
+            href_element = title_element.get('href', '')
+            if not href_element:
+                a_tag = title_element.find('a')
+                href_element = a_tag.get('href', '') if a_tag else ''
+            return url_from_href(href_element)
+        return extract
 
     if parse_method == "tag":
-
         url_tag = url_config.get('tag')
-        logging.info(f"url_tag: {url_tag}")
-
         url_attrs = url_config.get('attrs', {})
-        logging.info(f"url_attrs: {url_attrs}")
-       
-        # url_element = item.find(url_tag)
-        # logging.info(f"url_element: {url_element}")
-
-        url_element = item.find(url_tag, **url_attrs)
-        logging.info(f"url_element: {url_element}")
-        if not url_element or 'href' not in url_element.attrs:
-            logging.info("*" * 80)
-            return "N/A"
 
-        url = url_element['href']
-        logging.info(f"url: {url}")
+        def extract(item, title_element):
+            url_element = item.find(url_tag, url_attrs)
+            if not url_element or 'href' not in url_element.attrs:
+                return "N/A"
+            return url_from_href(url_element['href'])
+        return extract
 
-        url = base_url + url if url != "N/A" and not url.startswith(('http://', 'https://')) else url
-        logging.info(f"url: {url}")
-        logging.info("*" * 80)
+    return lambda item, title_element: None
 
-        return url
+# Fallback parsers return (date_obj, has_year, time). The date is turned into an
+# ISO date by to_iso_date, which fills in the year when the text didn't have one.
 
-def parse_date_range(date_text, config):
-    date_config = config.get('date', {})
-    parse_method = date_config.get('parse_method')
-    
-    if parse_method == "parser.parse":
-        date_info = parser.parse(date_text, fuzzy=True)
-        logging.info(f"date_info: {date_info}")
-        date = date_info.strftime("%m-%d")
-        logging.info(f"date: {date}")
-        time = date_info.strftime("%I:%M %p")
-        logging.info(f"time: {time}")
-        logging.info("*" * 80)
-        return date, time
+FUZZY_DEFAULT = datetime(1904, 1, 1)  # leap year so "Feb 29" parses, this year back means the text had none
 
-    if parse_method == "time_range":
-        try:
-            date_info = parser.parse(date_text, fuzzy=True)
-            logging.info(f"date_info: {date_info}")
-            date = date_info.strftime("%m-%d")
-            logging.info(f"date: {date}")
-            time = date_info.strftime("%I:%M %p")
-            logging.info(f"time: {time}")
-            logging.info("*" * 80)
-            return date, time
-        except:
-            date_part, time_part = date_text.split("@")
-            logging.info(f"date_part: {date_part}")
-            logging.info(f"time_part: {time_part}")
-            date_obj = parser.parse(date_part, fuzzy=True)
-            logging.info(f"date_obj: {date_obj}")
-            date = date_obj.strftime("%m-%d")
-            logging.info(f"date: {date}")
-            time = time_part
-            logging.info(f"time: {time}")
-            logging.info("*" * 80)
-            return date, time
-
-
-    if parse_method == "split":
-        date_info, time_info = date_text.split(",")
-        logging.info(f"date_info: {date_info}")
-        logging.info(f"time_info: {time_info}")
-        date_obj = datetime.strptime(date_info, "%b %d")
-        logging.info(f"date_obj: {date_obj}")
-        date = datetime.strftime(date_obj, "%m-%d")
-        logging.info(f"date: {date}")
-        time_info = time_info[6:14]
-        logging.info(f"time_info: {time_info}")
-        if time_info != "":
-            time_obj = parser.parse(time_info)
-            logging.info(f"time_obj: {time_obj}")
-            time = datetime.strftime(time_obj, "%I:%M %p")
-        else:
-            time = "12:00 AM"
-        logging.info(f"time: {time}")
-        logging.info("*" * 80)
-        return date, time
-    if parse_method == "split '@'":
-        date_info, time_info = date_text.split(" @ ")
-        logging.info(f"date_info: {date_info}")
-        logging.info(f"time_info: {time_info}")
-        date_obj = datetime.strptime(date_info, "%B %d")
-        logging.info(f"date_obj: {date_obj}")
-        date = datetime.strftime(date_obj, "%m-%d")
-        logging.info(f"date: {date}")
-        
+def parse_date_parser(date_text):
+    date_info = parser.parse(date_text, fuzzy=True, default=FUZZY_DEFAULT)
+    return date_info, date_info.year != FUZZY_DEFAULT.year, date_info.strftime("%I:%M %p")
+
+def parse_date_time_range(date_text):
+    try:
+        return parse_date_parser(date_text)
+    except (ValueError, OverflowError):
+        date_part, time_part = date_text.split("@")
+        date_obj = parser.parse(date_part, fuzzy=True, default=FUZZY_DEFAULT)
+        return date_obj, date_obj.year != FUZZY_DEFAULT.year, time_part
+
+def parse_date_split(date_text):
+    date_info, time_info = date_text.split(",")
+    date_obj = datetime.strptime(date_info, "%b %d")
+    time_info = time_info[6:14]
+    if time_info != "":
         time_obj = parser.parse(time_info)
-        logging.info(f"time_obj: {time_obj}")
         time = datetime.strftime(time_obj, "%I:%M %p")
-        logging.info(f"time: {time}")
-        logging.info("*" * 80)
-        return date, time
+    else:
+        time = "12:00 AM"
+    return date_obj, False, time
+
+def parse_date_split_at(date_text):
+    date_info, time_info = date_text.split(" @ ")
+    date_obj = datetime.strptime(date_info, "%B %d")
+    time_obj = parser.parse(time_info)
+    time = datetime.strftime(time_obj, "%I:%M %p")
+    return date_obj, False, time
+
+DATE_PARSERS = {
+    "parser.parse": parse_date_parser,
+    "time_range": parse_date_time_range,
+    "split": parse_date_split,
+    "split '@'": parse_date_split_at,
+}
 
+def reference_date():
+    return REFERENCE_DATE or date.today()
 
-def extract_date_and_time(item, config):
-    date_config = config.get('date', {})
-    logging.info(f"date_config: {date_config}")
+def infer_event_date(month, day):
+    # listings only show upcoming events, so a month/day far enough in the past is next year's
+    today = reference_date()
+    for year in range(today.year, today.year + 5):
+        try:
+            candidate = date(year, month, day)
+        except ValueError:
+            continue  # Feb 29 outside a leap year
+        if (today - candidate).days <= YEAR_ROLLOVER_DAYS:
+            return candidate
+    return None
+
+def to_iso_date(date_obj, has_year):
+    if has_year:
+        return date_obj.strftime("%Y-%m-%d")
+    event_date = infer_event_date(date_obj.month, date_obj.day)
+    return event_date.isoformat() if event_date else "N/A"
+
+MONTHS = {name: number for number, name in enumerate(
+    ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)}
+
+TIME_PATTERN = re.compile(
+    r'^\s*(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>[ap]\.?m\.?)?'
+    r'(?:\s*[-–]\s*(?P<end_hour>\d{1,2})(?::\d{2})?\s*(?P<end_ampm>[ap]\.?m\.?))?',
+    re.IGNORECASE
+)
+
+def parse_time_text(time_text):
+    # "7pm", "5:30-8:30pm", "7:00 PM - 9:00 PM" -> start time, "12:00 AM" when there isn't one
+    found = TIME_PATTERN.match(time_text or '')
+    if not found:
+        return "12:00 AM"
+    hour = int(found.group('hour'))
+    minute = int(found.group('minute') or 0)
+    ampm = found.group('ampm')
+    is_pm = bool(ampm) and ampm[0].lower() == 'p'
+    if not ampm and found.group('end_ampm'):
+        # "5:30-8:30pm" borrows the end's meridiem, unless the range crosses noon ("11-1pm")
+        ampm = found.group('end_ampm')
+        is_pm = ampm[0].lower() == 'p'
+        if hour % 12 > int(found.group('end_hour')) % 12:
+            is_pm = not is_pm
+    if ampm:
+        if not 1 <= hour <= 12:
+            return "12:00 AM"
+        hour = hour % 12 + (12 if is_pm else 0)
+    elif found.group('minute') is None:
+        return "12:00 AM"  # a bare number isn't a time
+    if hour > 23 or minute > 59:
+        return "12:00 AM"
+    return datetime(2000, 1, 1, hour, minute).strftime("%I:%M %p")
+
+def compile_date_format(date_format):
+    # "%B %d @ %I:%M %p" is a strptime format, anything else is a regex with
+    # month, day and optional year / time groups
+    if '%' in date_format:
+        has_year = '%Y' in date_format or '%y' in date_format
+        has_time = '%I' in date_format or '%H' in date_format
+
+        def match(date_text):
+            try:
+                date_obj = datetime.strptime(date_text, date_format)
+            except ValueError:
+                return None
+            time = date_obj.strftime("%I:%M %p") if has_time else "12:00 AM"
+            return to_iso_date(date_obj, has_year), time
+    else:
+        pattern = re.compile(date_format, re.IGNORECASE)
+        if not {'month', 'day'} <= set(pattern.groupindex):
+            raise ValueError(f"date format {date_format!r} needs month and day groups")
+
+        def match(date_text):
+            found = pattern.match(date_text)
+            if not found:
+                return None
+            month_text, day, year = found.group('month'), int(found.group('day')), found.groupdict().get('year')
+            month = int(month_text) if month_text.isdigit() else MONTHS.get(month_text[:3].lower())
+            try:
+                event_date = date(int(year), month, day) if year else infer_event_date(month, day)
+            except (TypeError, ValueError):
+                return None
+            if event_date is None:
+                return None
+            return event_date.isoformat(), parse_time_text(found.groupdict().get('time'))
+
+    match.date_format = date_format
+    return match
+
+DATE_PATH_COUNTS = Counter()
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date_cached(parse_method, date_formats, date_text):
+    # the same date strings repeat across items ("Aug 19", "Recurring daily"),
+    # so each distinct string is only parsed once. The site's precompiled
+    # formats are tried first, fuzzy dateutil parsing only runs on a miss.
+    # Also returns which path parsed it, counted by the caller on every lookup.
+    for date_format in date_formats:
+        result = date_format(date_text)
+        if result is not None:
+            return (*result, f"format: {date_format.date_format}")
+
+    date_obj, has_year, time = DATE_PARSERS[parse_method](date_text)
+    return to_iso_date(date_obj, has_year), time, f"fallback: {parse_method}"
+
+def compile_date_parser(date_config):
+    parse_method = date_config.get('parse_method')
+    if parse_method is None:
+        return None
+    if parse_method not in DATE_PARSERS:
+        raise ValueError(f"date: unknown parse_method {parse_method!r}")
+    date_formats = tuple(compile_date_format(date_format) for date_format in date_config.get('formats', []))
+
+    def parse_date(date_text):
+        # counted outside the cache so a repeated string counts every time
+        event_date, time, date_path = parse_date_cached(parse_method, date_formats, date_text)
+        DATE_PATH_COUNTS[date_path] += 1
+        return event_date, time
+    return parse_date
+
+def resolve_date_selector(date_config):
     extract_method = date_config.get('extract_method')
-    logging.info(f"extract_method: {extract_method}")
     date_tag = date_config.get('tag')
-    logging.info(f"date_tag: {date_tag}")
-    date_attrs = date_config.get('attrs')
-    logging.info(f"date_attrs: {date_attrs}")
-    
+    date_attrs = date_config.get('attrs') or {}
     if not date_tag:
-        logging.info("*" * 80)
-        return "N/A", "N/A"
-    
-    if extract_method == "attrs":
-
-        date_element = item.find(date_tag, **date_attrs) if date_attrs else item.find(date_tag)
-        logging.info(f"date_element: {date_element}")
+        return None, {}
+    if extract_method not in ("attrs", "tag"):
+        raise ValueError(f"date: unknown extract_method {extract_method!r}")
+    if isinstance(date_tag, dict):
+        # bs4 only matches the keys of a dict passed as the tag name, the nested attrs never applied
+        date_tag = next(iter(date_tag))
+    if extract_method == "tag":
+        date_attrs = {}
+    return date_tag, date_attrs
+
+def compile_date_from_text(parse_date, site_name=None):
+    # date text -> (ISO date, time), shared with the browser engine
+    def date_from_text(date_text):
+        date, time = parse_date(date_text)
+        if execute_trace:
+            trace(site_name, "date", date_text=date_text, date=date, time=time)
+        if time == "12:00 AM":
+            time = "Open link for time"
+        return date, time
+    return date_from_text
 
+def compile_date_and_time(date_config, date_from_text):
+    date_tag, date_attrs = resolve_date_selector(date_config)
+    if not date_tag:
+        return lambda item: ("N/A", "N/A")
 
-        
+    def extract(item):
+        date_element = item.find(date_tag, date_attrs)
         if not date_element:
-            logging.info("*" * 80)
             return "N/A", "N/A"
-        
-        date_text = date_element.text.strip()
-        logging.info(f"date_text: {date_text}")
-        
+        return date_from_text(date_element.text.strip())
+    return extract
 
-    elif extract_method == "tag":
-        date_element = item.find(date_tag,)
-        logging.info(f"date_element: {date_element}")
-        date_text =date_element.text.strip()
-        logging.info(f"date_text: {date_text}")
+BACKGROUND_IMAGE_URL = re.compile(r'background-image:\s*url\("(.+?)"\)')
 
-    
+def srcset_url(srcset):
+    urls = srcset.split(', ')
+    for url in urls:
+        if '220w' in url:
+            return url.split(' ')[0]
+    return urls[0].split(' ')[0] if urls else "N/A"
 
-    date, time = parse_date_range(date_text, config)  
-    if time == "12:00 AM":
-        time = "Open link for time"
-    logging.info("*" * 80)
-    return date, time  
+def background_image_url(style):
+    match = BACKGROUND_IMAGE_URL.search(style)
+    return match.group(1) if match else "N/A"
 
-def extract_image_url(item, config):
-    img_config = config.get('img', {})
+def compile_image_url(img_config):
     if not img_config:
-        return "N/A"
-    
+        return lambda item: "N/A"
     parse_method = img_config.get('parse_method')
-    
+
     if parse_method == 'lazy-src':
-        img_tag, img_attrs = next(iter(img_config.items()))
-        img_element = item.find(img_tag, **img_attrs)
-        return img_element.get('data-lazy-src') or img_element.get('src') if img_element else "N/A"
-    
-    elif parse_method == 'srcset_220w':
-        container_tag, container_attrs = next(iter(img_config['container'].items()))
-        container = item.find(container_tag, **container_attrs)
+        img_tag, img_attrs = resolve_matcher(img_config, 'img')
+
+        def extract(item):
+            img_element = item.find(img_tag, img_attrs)
+            if not img_element:
+                return "N/A"
+            return img_element.get('data-lazy-src') or img_element.get('src')
+        return extract
+
+    if parse_method not in ('srcset_220w', 'style_background', 'none'):
+        if parse_method is None:
+            return lambda item: "N/A"
+        raise ValueError(f"img: unknown parse_method {parse_method!r}")
+
+    container_tag, container_attrs = resolve_matcher(img_config.get('container'), 'img container')
+    if not container_tag:
+        raise ValueError(f"img: parse_method {parse_method!r} needs a container")
+
+    if parse_method == 'srcset_220w':
+        img_tag, img_attr = img_config['tag'], img_config['attr']
+
+        def extract(item):
+            container = item.find(container_tag, container_attrs)
+            if not container:
+                return "N/A"
+            img_element = container.find(img_tag)
+            if not img_element or img_attr not in img_element.attrs:
+                return "N/A"
+            return srcset_url(img_element[img_attr])
+        return extract
+
+    if parse_method == 'style_background':
+        def extract(item):
+            container = item.find(container_tag, container_attrs)
+            if not container or 'style' not in container.attrs:
+                return "N/A"
+            return background_image_url(container['style'])
+        return extract
+
+    img_tag, img_attr = img_config['tag'], img_config['attr']
+
+    def extract(item):
+        container = item.find(container_tag, container_attrs)
         if not container:
             return "N/A"
-        img_element = container.find(img_config['tag'])
-        if not img_element or img_config['attr'] not in img_element.attrs:
-            return "N/A"
-        srcset = img_element[img_config['attr']]
-        urls = srcset.split(', ')
-        for url in urls:
-            if '220w' in url:
-                return url.split(' ')[0]
-        return urls[0].split(' ')[0] if urls else "N/A"
-    
-    elif parse_method == 'style_background':
-        container_tag, container_attrs = next(iter(img_config['container'].items()))
-        container = item.find(container_tag, **container_attrs)
-        if not container or 'style' not in container.attrs:
-            return "N/A"
-        style = container['style']
-        match = re.search(r'background-image:\s*url\("(.+?)"\)', style)
-        return match.group(1) if match else "N/A"
-    
-    elif parse_method == 'none':
-        container_tag, container_attrs = next(iter(img_config['container'].items()))
-        container = item.find(container_tag, **container_attrs)
-        if not container:
+        img_element = container.find(img_tag)
+        return img_element.get(img_attr) if img_element else "N/A"
+    return extract
+
+def compile_location(location_config):
+    location_tag, location_attrs = resolve_matcher(location_config, 'location')
+    if not location_tag:
+        return lambda item: "N/A"
+    parent_class = location_config.get('parent', {}).get('class')
+
+    def extract(item):
+        parent_element = item.find('div', class_=parent_class) if parent_class else item
+        location_elements = parent_element.find_all(location_tag, location_attrs)
+        return " | ".join([loc.text.strip() for loc in location_elements]) if location_elements else "N/A"
+    return extract
+
+def compile_recurrence(recurrence_config):
+    recurrence_tag, recurrence_attrs = resolve_matcher(recurrence_config, 'recurrence')
+    if not recurrence_tag:
+        return lambda item: "N/A"
+
+    def extract(item):
+        recurrence_element = item.find(recurrence_tag, recurrence_attrs)
+        return recurrence_element.text.strip() if recurrence_element else "N/A"
+    return extract
+
+def compile_category(category_config):
+    category_tag, category_attrs = resolve_matcher(category_config, 'category')
+    if not category_tag:
+        return lambda item: "N/A"
+
+    def extract(item):
+        category_elements = item.find_all(category_tag, category_attrs)
+        return [cat.text.strip() for cat in category_elements] if category_elements else ["N/A"]
+    return extract
+
+def compile_details(details_config):
+    details_tag, details_attrs = resolve_matcher(details_config, 'details')
+    if not details_tag:
+        return lambda item: "N/A"
+
+    def extract(item):
+        details_element = item.find(details_tag, details_attrs)
+        if not details_element:
             return "N/A"
-        img_element = container.find(img_config['tag'])
-        return img_element.get(img_config['attr']) if img_element else "N/A"
-    
-    return "N/A"
+        details_text = ' '.join(details_element.stripped_strings)
+        return details_text if details_text else "N/A"
+    return extract
+
+
+class SiteExtractor:
+    __slots__ = (
+        'site_name', 'content_list_tag', 'content_list_attrs', 'item_tag', 'item_attrs',
+        'title', 'event_url', 'parse_date', 'date_and_time', 'image_url',
+        'location', 'recurrence', 'category', 'details',
+        'url_from_href', 'date_from_text', 'browser_spec', 'browser_image', 'browser_unsupported',
+        'json_endpoint', 'config_digest',
+    )
+
+    def __init__(self, site_name, config):
+        self.site_name = site_name
+        self.config_digest = config_digest(config)
+        try:
+            if 'content_list_class' not in config or 'item_attr' not in config:
+                raise ValueError("content_list_class and item_attr are required")
+            self.content_list_tag, self.content_list_attrs = resolve_matcher(config['content_list_class'], 'content_list_class')
+            self.item_tag, self.item_attrs = resolve_matcher(config['item_attr'], 'item_attr')
+            self.title = compile_title(config.get('title', {}))
+            self.event_url = compile_event_url(config.get('event_url', {}))
+            self.url_from_href = compile_url_from_href(config.get('event_url', {}))
+            self.parse_date = compile_date_parser(config.get('date', {}))
+            if resolve_date_selector(config.get('date', {}))[0] and self.parse_date is None:
+                raise ValueError("date: a tag is configured but no parse_method")
+            self.date_from_text = compile_date_from_text(self.parse_date, site_name)
+            self.date_and_time = compile_date_and_time(config.get('date', {}), self.date_from_text)
+            self.image_url = compile_image_url(config.get('img', {}))
+            self.location = compile_location(config.get('location', {}))
+            self.recurrence = compile_recurrence(config.get('recurrence', {}))
+            self.category = compile_category(config.get('category', {}))
+            self.details = compile_details(config.get('details', {}))
+            self.browser_image = compile_browser_image(config.get('img', {}))
+            self.json_endpoint = compile_json_endpoint(config)
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid SITES config for {site_name}: {e}") from e
+        # not every selector has a css equivalent, those sites stay on BeautifulSoup
+        try:
+            self.browser_spec = compile_browser_spec(config)
+            self.browser_unsupported = None
+        except ValueError as e:
+            self.browser_spec = None
+            self.browser_unsupported = str(e)
+
+    def find_items(self, parsed_content):
+        content_list = parsed_content.find(self.content_list_tag, self.content_list_attrs) if self.content_list_attrs else parsed_content
+        if not content_list:
+            return None
+        return content_list.find_all(self.item_tag, self.item_attrs)
+
+    def extract(self, item, seen_events=None):
+        title, title_element = self.title(item)
+        event_date, event_time = self.date_and_time(item)
+        url = self.event_url(item, title_element)
+
+        # title, date, time and url recognise an event from an earlier run, the item's text says whether it was edited
+        if seen_events is not None:
+            fingerprint = event_fingerprint(self.site_name, url, event_date, event_time, title)
+            item_digest = content_digest(item.get_text())
+            seen_event = seen_events.get(self.site_name, fingerprint, self.config_digest, item_digest)
+            if seen_event is not None:
+                return seen_event
+
+        event = {}
+        event['title'] = title
+        event['details'] = self.details(item)
+        event['date'], event['time'] = event_date, event_time
+        event['location'] = self.location(item)
+        event['url'] = url
+        event['image_url'] = self.image_url(item)
+
+        # event['recurrence'] = self.recurrence(item)
+        # event['category'] = self.category(item)
+
+        if execute_trace:
+            trace(self.site_name, "item", title_element=title_element, **event)
+        if seen_events is not None:
+            seen_events.add(self.site_name, fingerprint, event, self.config_digest, item_digest)
+        return event
+
+    def extract_row(self, row, seen_events=None):
+        # same event as extract(), from the raw strings EXTRACT_ITEMS_SCRIPT returned for one item
+        title = row.get('title', "N/A")
+        event_date, event_time = self.date_from_text(row['date']) if 'date' in row else ("N/A", "N/A")
+        url = self.url_from_href(row.get('href'))
+
+        if seen_events is not None:
+            fingerprint = event_fingerprint(self.site_name, url, event_date, event_time, title)
+            item_digest = content_digest(json.dumps(row, sort_keys=True))
+            seen_event = seen_events.get(self.site_name, fingerprint, self.config_digest, item_digest)
+            if seen_event is not None:
+                return seen_event
+
+        locations = row.get('location')
+        event = {}
+        event['title'] = title
+        event['details'] = row.get('details') or "N/A"
+        event['date'], event['time'] = event_date, event_time
+        event['location'] = " | ".join(locations) if locations else "N/A"
+        event['url'] = url
+        event['image_url'] = self.browser_image(row.get('image'))
+
+        if execute_trace:
+            trace(self.site_name, "item", title_element=None, **event)
+        if seen_events is not None:
+            seen_events.add(self.site_name, fingerprint, event, self.config_digest, item_digest)
+        return event
+
+    def extract_json(self, item, seen_events=None):
+        # same event as extract(), from one item of the site's json_endpoint
+        fields = self.json_endpoint['fields']
+        title = json_text(json_path(item, fields['title']))
+        event_date, event_time = json_date_and_time(json_path(item, fields['date']))
+        url = json_path(item, fields.get('url')) or "N/A"
+
+        if seen_events is not None:
+            fingerprint = event_fingerprint(self.site_name, url, event_date, event_time, title)
+            item_digest = content_digest(json.dumps(item, sort_keys=True, default=str))
+            seen_event = seen_events.get(self.site_name, fingerprint, self.config_digest, item_digest)
+            if seen_event is not None:
+                return seen_event
+
+        event = {}
+        event['title'] = title
+        event['details'] = json_text(json_path(item, fields.get('details')))
+        event['date'], event['time'] = event_date, event_time
+        event['location'] = json_text(json_path(item, fields.get('location')))
+        event['url'] = url
+        event['image_url'] = json_path(item, fields.get('image_url')) or "N/A"
+
+        if execute_trace:
+            trace(self.site_name, "item", title_element=None, **event)
+        if seen_events is not None:
+            seen_events.add(self.site_name, fingerprint, event, self.config_digest, item_digest)
+        return event
+
+
+_site_extractors = {}
+
+def get_extractor(config, site_name=None):
+    # keyed on the config object itself, the cache holds a reference so the id stays unique
+    cached = _site_extractors.get(id(config))
+    if cached is None:
+        cached = (config, SiteExtractor(site_name or config.get('url', ''), config))
+        _site_extractors[id(config)] = cached
+    return cached[1]
+
+def compile_sites(sites):
+    # validate every config before any browser is started
+    return {site_name: get_extractor(config, site_name) for site_name, config in sites.items()}
+
+
+####################
+# EXTRACTION 
+####################
+
+# thin wrappers for the debugging scripts and the benchmark, extract_events
+# goes through the compiled extractor directly
+
+def extract_title(item, config):
+    return get_extractor(config).title(item)
+
+def extract_event_url(item, title_element, config):
+    return get_extractor(config).event_url(item, title_element)
+
+def parse_date_range(date_text, config):
+    return get_extractor(config).parse_date(date_text)
+
+def extract_date_and_time(item, config):
+    return get_extractor(config).date_and_time(item)
+
+def extract_image_url(item, config):
+    return get_extractor(config).image_url(item)
 
 def extract_location(item, config):
-    location_tag, location_attrs = next(iter(config.get('location', {}).items()), (None, None))
-    if not location_tag:
-        return "N/A"
-    
-    parent_class = config.get('location', {}).get('parent', {}).get('class')
-    parent_element = item.find('div', class_=parent_class) if parent_class else item
-    
-    location_elements = parent_element.find_all(location_tag, **location_attrs) if location_attrs else parent_element.find_all(location_tag)
-    return " | ".join([loc.text.strip() for loc in location_elements]) if location_elements else "N/A"
+    return get_extractor(config).location(item)
 
 def extract_recurrence(item, config):
-    recurrence_tag, recurrence_attrs = next(iter(config.get('recurrence', {}).items()), (None, None))
-    if not recurrence_tag:
-        return "N/A"
-    
-    recurrence_element = item.find(recurrence_tag, **recurrence_attrs) if recurrence_attrs else item.find(recurrence_tag)
-    return recurrence_element.text.strip() if recurrence_element else "N/A"
+    return get_extractor(config).recurrence(item)
 
 def extract_category(item, config):
-    category_tag, category_attrs = next(iter(config.get('category', {}).items()), (None, None))
-    if not category_tag:
-        return "N/A"
-    
-    category_elements = item.find_all(category_tag, **category_attrs) if category_attrs else item.find_all(category_tag)
-    return [cat.text.strip() for cat in category_elements] if category_elements else ["N/A"]
+    return get_extractor(config).category(item)
 
 def extract_details(item, config):
-    details_tag, details_attrs = next(iter(config.get('details', {}).items()), (None, None))
-    if not details_tag:
-        return "N/A"
-    
-    details_element = item.find(details_tag, **details_attrs) if details_attrs else item.find(details_tag)
-    if not details_element:
-        return "N/A"
-    
-    details_text = ' '.join(details_element.stripped_strings)
-    return details_text if details_text else "N/A"
+    return get_extractor(config).details(item)
 
 
 ####################
 # main extraction
 ####################
 
-def extract_events(parsed_content, config):
-    events = []
-    content_list_tag, content_list_attrs = next(iter(config['content_list_class'].items()))
-    content_list = parsed_content.find(content_list_tag, **content_list_attrs) if content_list_attrs else parsed_content
-    
-    if not content_list:
+def extract_events(parsed_content, config, seen_events=None):
+    extractor = get_extractor(config)
+    items = extractor.find_items(parsed_content)
+    if items is None:
         logging.error("Couldn't find content list")
-        return events
+        return []
 
-    item_tag, item_attrs = next(iter(config['item_attr'].items()))
-    items = content_list.find_all(item_tag, **item_attrs) if item_attrs else content_list.find_all(item_tag)
+    extract = extractor.extract
+    return [extract(item, seen_events) for item in items]
 
-    for item in items:
-        title, title_element = extract_title(item, config)
-        event = {}
-        event['title'] = title
-        event['details'] = extract_details(item, config)        
-        event['date'], event['time'] = extract_date_and_time(item, config)
-        event['location'] = extract_location(item, config)
-        event['url'] = extract_event_url(item, title_element, config)
-        event['image_url'] = extract_image_url(item, config)
-        
-        # event['recurrence'] = extract_recurrence(item, config)
-        # event['category'] = extract_category(item, config)
-        
-        events.append(event)
-    
+
+####################
+# BROWSER EXTRACTION
+####################
+
+# Alternative engine for browser-fetched sites ("extract_engine": "browser"): the
+# SITES config is compiled into a spec of css selectors, EXTRACT_ITEMS_SCRIPT walks
+# the live DOM with it in one execute_script call and returns raw strings per item,
+# and SiteExtractor.extract_row does the same date/url/image normalization as the
+# BeautifulSoup path. No page_source transfer and no second DOM build.
+
+EXTRACT_ITEMS_SCRIPT = """
+    var spec = arguments[0];
+    var container = spec.content_list ? document.querySelector(spec.content_list) : document;
+    if (!container) { return null; }
+
+    function find(element, selector) {
+        return element && selector ? element.querySelector(selector) : null;
+    }
+    function text(element) {
+        return element.textContent.trim();
+    }
+    function strippedStrings(element) {
+        // BeautifulSoup's ' '.join(stripped_strings), script and style text isn't included
+        var parts = [];
+        var walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) {
+            var parentName = walker.currentNode.parentNode.nodeName;
+            if (parentName === 'SCRIPT' || parentName === 'STYLE' || parentName === 'TEMPLATE') { continue; }
+            var part = walker.currentNode.nodeValue.trim();
+            if (part) { parts.push(part); }
+        }
+        return parts.join(' ');
+    }
+    function attribute(element, name) {
+        return element && element.hasAttribute(name) ? element.getAttribute(name) : null;
+    }
+
+    var rows = [];
+    var items = container.querySelectorAll(spec.item);
+    for (var i = 0; i < items.length; i++) {
+        var item = items[i];
+        var row = {};
+
+        var titleElement = find(item, spec.title);
+        if (titleElement) {
+            var titleLink = titleElement.nodeName === 'A' ? titleElement : titleElement.querySelector('a');
+            row.title = text(titleLink || titleElement);
+            if (spec.url_method === 'title') {
+                var nestedLink = titleElement.querySelector('a');
+                row.href = titleElement.getAttribute('href') || (nestedLink && nestedLink.getAttribute('href')) || '';
+            }
+        }
+        if (spec.url_method === 'tag') {
+            row.href = attribute(find(item, spec.url), 'href');
+        }
+
+        var dateElement = find(item, spec.date);
+        if (dateElement) { row.date = text(dateElement); }
+
+        if (spec.location) {
+            var locationParent = spec.location_parent ? find(item, spec.location_parent) : item;
+            if (locationParent) {
+                row.location = Array.prototype.map.call(locationParent.querySelectorAll(spec.location), text);
+            }
+        }
+
+        var detailsElement = find(item, spec.details);
+        if (detailsElement) { row.details = strippedStrings(detailsElement); }
+
+        if (spec.img_method === 'lazy-src') {
+            var lazyImage = find(item, spec.img);
+            row.image = lazyImage ? (lazyImage.getAttribute('data-lazy-src') || lazyImage.getAttribute('src')) : 'N/A';
+        } else if (spec.img_method === 'style_background') {
+            row.image = attribute(find(item, spec.img_container), 'style');
+        } else if (spec.img_method === 'srcset_220w' || spec.img_method === 'none') {
+            var imageContainer = find(item, spec.img_container);
+            var image = find(imageContainer, spec.img);
+            if (!imageContainer) { row.image = 'N/A'; }
+            else if (spec.img_method === 'none') { row.image = image ? image.getAttribute(spec.img_attr) : 'N/A'; }
+            else { row.image = attribute(image, spec.img_attr); }
+        }
+        rows.push(row);
+    }
+    return rows;
+"""
+
+def browser_selector(tag, attrs, field):
+    if not tag:
+        return None
+    selector_config = {tag: attrs}
+    if not css_selector_exact(selector_config):
+        raise ValueError(f"{field}: {attrs!r} has no css equivalent")
+    return config_to_css_selector(selector_config)
+
+def compile_browser_spec(config):
+    content_list_tag, content_list_attrs = resolve_matcher(config['content_list_class'], 'content_list_class')
+    url_config = config.get('event_url', {})
+    img_config = config.get('img') or {}
+    location_config = config.get('location', {})
+    img_method = img_config.get('parse_method') if img_config else None
+
+    spec = {
+        'content_list': browser_selector(content_list_tag, content_list_attrs, 'content_list_class') if content_list_attrs else None,
+        'item': browser_selector(*resolve_matcher(config['item_attr'], 'item_attr'), 'item_attr'),
+        'title': browser_selector(*resolve_matcher(config.get('title', {}), 'title'), 'title'),
+        'url_method': url_config.get('parse_method'),
+        'url': browser_selector(url_config.get('tag'), url_config.get('attrs', {}), 'event_url') if url_config.get('parse_method') == "tag" else None,
+        'date': browser_selector(*resolve_date_selector(config.get('date', {})), 'date'),
+        'location': browser_selector(*resolve_matcher(location_config, 'location'), 'location'),
+        'location_parent': None,
+        'details': browser_selector(*resolve_matcher(config.get('details', {}), 'details'), 'details'),
+        'img_method': img_method,
+    }
+    parent_class = location_config.get('parent', {}).get('class')
+    if spec['location'] and parent_class:
+        spec['location_parent'] = browser_selector('div', {'class': parent_class}, 'location parent')
+    if img_method == 'lazy-src':
+        spec['img'] = browser_selector(*resolve_matcher(img_config, 'img'), 'img')
+    elif img_method in ('srcset_220w', 'style_background', 'none'):
+        spec['img_container'] = browser_selector(*resolve_matcher(img_config.get('container'), 'img container'), 'img container')
+        spec['img'] = img_config.get('tag')
+        spec['img_attr'] = img_config.get('attr')
+    return spec
+
+def compile_browser_image(img_config):
+    # raw value from EXTRACT_ITEMS_SCRIPT -> image url, the same answer compile_image_url gives
+    parse_method = img_config.get('parse_method') if img_config else None
+    if parse_method == 'srcset_220w':
+        return lambda raw: srcset_url(raw) if raw is not None else "N/A"
+    if parse_method == 'style_background':
+        return lambda raw: background_image_url(raw) if raw is not None else "N/A"
+    if parse_method in ('lazy-src', 'none'):
+        return lambda raw: raw
+    return lambda raw: "N/A"
+
+class BrowserRows(list):
+    # what fetch_page hands back instead of html when the browser engine ran
+    pass
+
+def browser_rows(site_name, config, driver):
+    extractor = get_extractor(config)
+    if extractor.browser_spec is None:
+        logging.warning(f"{site_name}: can't run the browser engine ({extractor.browser_unsupported}), using BeautifulSoup")
+        return None
+    start_time = time.perf_counter()
+    rows = driver.execute_script(EXTRACT_ITEMS_SCRIPT, extractor.browser_spec)
+    if not rows:
+        logging.info(f"{site_name}: browser engine found no items, falling back to the page html")
+        return None
+    logging.info(f"{site_name}: {len(rows)} items extracted in the browser in {time.perf_counter() - start_time:.2f}s")
+    return BrowserRows(rows)
+
+def extract_browser_rows(rows, config, seen_events=None):
+    extract_row = get_extractor(config).extract_row
+    return [extract_row(row, seen_events) for row in rows]
+
+
+####################
+# JSON ENDPOINTS
+####################
+
+# fetch_mode "json" skips rendering and reads the feed behind the page (find one
+# with --capture-network). The site's html config stays as the fallback.
+#
+#   "json_endpoint": {
+#       "url": "https://example.com/api/events",
+#       "params": {"per_page": 50},                 # optional query string
+#       "headers": {},                              # optional
+#       "events_path": "events",                    # dotted path to the list of events, "" for a top level list
+#       "fields": {"title": "title", "date": "start_date", "url": "url",
+#                  "location": "venue.venue", "image_url": "image.url", "details": "description"},
+#   },
+
+def compile_json_endpoint(config):
+    platform_config = config.get('platform')
+    if config.get('fetch_mode') == "platform" and not platform_config:
+        raise ValueError('fetch_mode "platform" needs a platform')
+    if platform_config:
+        # adapters hand back {"events": [...]}, their default field paths can be overridden per site
+        adapter = platform_config.get('adapter')
+        if adapter not in PLATFORM_ADAPTERS:
+            raise ValueError(f"platform: unknown adapter {adapter!r}, expected one of {sorted(PLATFORM_ADAPTERS)}")
+        for option in PLATFORM_ADAPTERS[adapter][1]:
+            if option not in platform_config:
+                raise ValueError(f"platform: {adapter} needs {option!r}")
+        json_endpoint = {'events_path': "events", 'fields': {**PLATFORM_ADAPTERS[adapter][2], **platform_config.get('fields', {})}}
+    else:
+        json_endpoint = config.get('json_endpoint')
+    if config.get('fetch_mode') == "json" and not json_endpoint:
+        raise ValueError('fetch_mode "json" needs a json_endpoint')
+    if not json_endpoint:
+        return None
+    if ('url' not in json_endpoint and not platform_config) or 'events_path' not in json_endpoint:
+        raise ValueError("json_endpoint: url and events_path are required")
+    fields = json_endpoint.get('fields', {})
+    if 'title' not in fields or 'date' not in fields:
+        raise ValueError("json_endpoint: fields needs at least title and date")
+    return json_endpoint
+
+def json_path(data, path):
+    # "venue.address.city" or "images.0.url", None when any step is missing
+    if not path:
+        return data if path == "" else None
+    for key in path.split('.'):
+        if isinstance(data, list) and key.isdigit() and int(key) < len(data):
+            data = data[int(key)]
+        elif isinstance(data, dict):
+            data = data.get(key)
+        else:
+            return None
+        if data is None:
+            return None
+    return data
+
+def json_text(value):
+    # feeds hand back entity-encoded strings, html fragments and lists
+    if value is None or value == "" or value == []:
+        return "N/A"
+    if isinstance(value, list):
+        return " | ".join(json_text(part) for part in value)
+    if isinstance(value, dict):
+        value = next((value[key] for key in ('name', 'title', 'venue', 'text') if value.get(key)), "")
+        return json_text(value)
+    # unescape first, some feeds escape their html fragments ("&lt;p&gt;...")
+    value = html.unescape(str(value))
+    if '<' in value:
+        value = ' '.join(BeautifulSoup(value, soup_builder()).stripped_strings)
+    value = value.strip()
+    return value if value else "N/A"
+
+def json_date_and_time(value):
+    # a date path can land on a dict or list ({"$date": ...}), those aren't hashable for the cache
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value, sort_keys=True)
+    return json_date_cached(value)
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def json_date_cached(value):
+    # ISO timestamps mostly, unix seconds sometimes, anything else goes through dateutil
+    if value in (None, ""):
+        return "N/A", "N/A"
+    has_year = True
+    try:
+        if isinstance(value, (int, float)):
+            date_obj, has_time = datetime.fromtimestamp(value, LOCAL_TIMEZONE), True
+        else:
+            date_obj, has_time = datetime.fromisoformat(value), len(value) > 10
+    except (TypeError, ValueError, OverflowError, OSError):
+        try:
+            date_obj = parser.parse(str(value), fuzzy=True, default=FUZZY_DEFAULT)
+        except (ValueError, OverflowError):
+            return "N/A", "N/A"
+        has_year, has_time = date_obj.year != FUZZY_DEFAULT.year, True
+    if date_obj.tzinfo is not None:
+        # "2024-08-20T23:30:00Z" is 7:30 PM on the 20th here, not 11:30 PM (or the next day)
+        date_obj = date_obj.astimezone(LOCAL_TIMEZONE)
+    event_date = date_obj.strftime("%Y-%m-%d") if has_year else to_iso_date(date_obj, False)
+    time = date_obj.strftime("%I:%M %p") if has_time else "12:00 AM"
+    return event_date, time if time != "12:00 AM" else "Open link for time"
+
+class JsonPayload:
+    # what fetch_site hands back instead of html for fetch_mode "json"
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+def fetch_json(site_name, config):
+    json_endpoint = get_extractor(config).json_endpoint
+    try:
+        response = get_http_session().get(json_endpoint['url'], params=json_endpoint.get('params'),
+                                          headers=json_endpoint.get('headers'), timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        return JsonPayload(response.json())
+    except (requests.RequestException, ValueError) as e:
+        logging.error(f"Error fetching {json_endpoint['url']} for {site_name}: {e}")
+        return None
+
+def extract_json_events(payload, config, seen_events=None):
+    extractor = get_extractor(config)
+    items = json_path(payload.data, extractor.json_endpoint['events_path'])
+    if not isinstance(items, list):
+        logging.error(f"No list at events_path {extractor.json_endpoint['events_path']!r}")
+        return []
+    extract_json = extractor.extract_json
+    return [extract_json(item, seen_events) for item in items]
+
+
+####################
+# PLATFORM ADAPTERS
+####################
+
+# Sites built on a known platform can skip their html and read the platform's own
+# feed. Each adapter returns the raw items, and its field paths map them into the
+# usual event record through extract_json, same as a json_endpoint:
+#
+#   "fetch_mode": "platform",
+#   "fallback_fetch_mode": "auto",  # if the feed fails or looks wrong
+#   "platform": {"adapter": "tribe_events", "base_url": "https://chattlibrary.org"},
+
+def fetch_tribe_events(site_name, platform_config, config):
+    # The Events Calendar (WordPress) REST api, no key needed
+    url = platform_config['base_url'].rstrip('/') + '/wp-json/tribe/events/v1/events'
+    params = {'per_page': 50, 'start_date': reference_date().isoformat()}
+    events = []
+    for _ in range(PLATFORM_MAX_PAGES):
+        response = get_http_session().get(url, params=params, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        events.extend(data.get('events', []))
+        # next_rest_url already carries the query string
+        url, params = data.get('next_rest_url'), None
+        if not url:
+            break
+    return events
+
+SIMPLEVIEW_TOKEN_PATH = '/plugins/core/get_simple_token/'
+SIMPLEVIEW_EVENTS_PATH = '/includes/rest_v2/plugins_events_events_by_date/find/'
+
+def fetch_simpleview_events(site_name, platform_config, config):
+    # Simpleview CMS sites serve their event listings from rest_v2 with a short lived public token
+    base_url = platform_config['base_url'].rstrip('/')
+    session = get_http_session()
+    response = session.get(base_url + SIMPLEVIEW_TOKEN_PATH, timeout=HTTP_TIMEOUT)
+    response.raise_for_status()
+    token = response.text.strip()
+
+    start = reference_date()
+    end = start + timedelta(days=platform_config.get('days', 30))
+    limit = 100
+    events = []
+    for page in range(PLATFORM_MAX_PAGES):
+        query = {
+            "filter": {
+                "active": True,
+                "date_range": {"start": {"$date": f"{start.isoformat()}T00:00:00.000Z"},
+                               "end": {"$date": f"{end.isoformat()}T00:00:00.000Z"}},
+            },
+            "options": {"limit": limit, "skip": page * limit, "count": True, "castDocs": False,
+                        "sort": {"date": 1, "rank": 1, "title_sort": 1}},
+        }
+        response = session.get(base_url + SIMPLEVIEW_EVENTS_PATH, params={'json': json.dumps(query), 'token': token}, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        docs = response.json()['docs']
+        for item in docs.get('docs', []):
+            # dates are midnight local time sent as UTC, the time of day is in startTime
+            day = (item.get('date') or item.get('startDate') or '')[:10]
+            item['start'] = f"{day} {item['startTime']}" if day and item.get('startTime') else day
+            url = item.get('url') or ''
+            item['absolute_url'] = base_url + url if url.startswith('/') else url or None
+            events.append(item)
+        if (page + 1) * limit >= docs.get('count', 0):
+            break
     return events
+
+WEBFLOW_ITEMS_URL = "https://api.webflow.com/v2/collections/{collection_id}/items"
+
+def fetch_webflow_items(site_name, platform_config, config):
+    # Webflow CMS api, needs a site token (WEBFLOW_API_TOKEN or "token_env") and the events collection id
+    token_env = platform_config.get('token_env', 'WEBFLOW_API_TOKEN')
+    token = os.environ.get(token_env)
+    if not token:
+        logging.warning(f"{site_name}: {token_env} isn't set, can't use the webflow api")
+        return None
+    url = WEBFLOW_ITEMS_URL.format(collection_id=platform_config['collection_id'])
+    headers = {'Authorization': f"Bearer {token}", 'accept': 'application/json'}
+    items = []
+    offset = 0
+    for _ in range(PLATFORM_MAX_PAGES):
+        response = get_http_session().get(url, params={'offset': offset, 'limit': 100}, headers=headers, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        data = response.json()
+        page = data.get('items', [])
+        for item in page:
+            if item.get('isDraft') or item.get('isArchived'):
+                continue
+            slug = json_path(item, 'fieldData.slug')
+            if slug and 'url_template' in platform_config:
+                item['url'] = platform_config['url_template'].format(slug=slug)
+            items.append(item)
+        offset += len(page)
+        if not page or offset >= (json_path(data, 'pagination.total') or 0):
+            break
+    return items
+
+JSON_LD_BLOCK = re.compile(r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
+
+def json_ld_events(html_content):
+    # schema.org Event objects embedded in the page (The Events Calendar and plenty of others emit them)
+    events = []
+
+    def collect(value):
+        if isinstance(value, list):
+            for part in value:
+                collect(part)
+        elif isinstance(value, dict):
+            types = value.get('@type')
+            types = types if isinstance(types, list) else [types]
+            if any(isinstance(kind, str) and kind.endswith('Event') for kind in types):
+                image = value.get('image')
+                if isinstance(image, list):
+                    image = image[0] if image else None
+                if isinstance(image, dict):
+                    image = image.get('url')
+                events.append({**value, 'image': image})
+            elif '@graph' in value:
+                collect(value['@graph'])
+
+    for block in JSON_LD_BLOCK.findall(html_content):
+        try:
+            collect(json.loads(block))
+        except ValueError:
+            continue
+    return events
+
+def fetch_json_ld(site_name, platform_config, config):
+    html_content = fetch_page_http(site_name, config)
+    return json_ld_events(html_content) if html_content else None
+
+# adapter -> (fetch function, required platform options, default field paths)
+PLATFORM_ADAPTERS = {
+    "tribe_events": (fetch_tribe_events, ('base_url',), {
+        "title": "title", "date": "start_date", "url": "url", "location": "venue.venue",
+        "image_url": "image.url", "details": "description",
+    }),
+    "simpleview": (fetch_simpleview_events, ('base_url',), {
+        "title": "title", "date": "start", "url": "absolute_url", "location": "location",
+        "image_url": "media_raw.0.mediaurl", "details": "description",
+    }),
+    # collection fields are whatever the site named them, give at least "date" in the site's "fields"
+    "webflow": (fetch_webflow_items, ('collection_id',), {
+        "title": "fieldData.name", "url": "url",
+    }),
+    "json_ld": (fetch_json_ld, (), {
+        "title": "name", "date": "startDate", "url": "url", "location": "location.name",
+        "image_url": "image", "details": "description",
+    }),
+}
+
+def fetch_platform(site_name, config):
+    platform_config = config['platform']
+    fetch_items = PLATFORM_ADAPTERS[platform_config['adapter']][0]
+    try:
+        items = fetch_items(site_name, platform_config, config)
+    except (requests.RequestException, ValueError, KeyError, TypeError, AttributeError) as e:
+        logging.error(f"{site_name}: {platform_config['adapter']} feed failed: {e}")
+        return None
+    if not items:
+        return None
+    # a feed that answers but doesn't map (changed schema, wrong field paths) shouldn't replace the html path
+    fields = get_extractor(config).json_endpoint['fields']
+    usable = sum(1 for item in items if json_path(item, fields['title']) and json_path(item, fields['date']))
+    if usable * 2 < len(items):
+        logging.error(f"{site_name}: only {usable} of {len(items)} {platform_config['adapter']} items have a title and date")
+        return None
+    return JsonPayload({"events": items})
+
+
+####################
+# INCREMENTAL
+####################
+
+EVENT_FIELDS = ['title', 'details', 'date', 'time', 'location', 'url', 'image_url']
+
+def event_fingerprint(source, url, event_date, event_time, title):
+    # the time keeps two showings on one page (same url, same day) apart
+    key = "\x1f".join(str(part) for part in (source, url, event_date, event_time, title))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def event_key(source, event):
+    return event_fingerprint(source, event.get('url'), event.get('date'), event.get('time'), event.get('title'))
+
+def config_digest(config):
+    # digest of a site's SITES entry, events extracted under a different config are stale
+    # (a fixed selector has to take effect on the next run), EXTRACTOR_VERSION does the same
+    # for fixes to the parsing code. lambdas go in by their source
+    def encode(value):
+        if callable(value):
+            try:
+                return inspect.getsource(value).strip()
+            except (OSError, TypeError):
+                return value.__code__.co_code.hex()
+        return repr(value)
+    key = json.dumps([EXTRACTOR_VERSION, config], sort_keys=True, default=encode)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class SeenEventsIndex:
+    # fingerprint -> event from earlier runs, plus the events that are new this run
+    def __init__(self, file_name=SEEN_EVENTS_FILE):
+        self.file_name = file_name
+        self.run_date = date.today().isoformat()
+        self.entries = {}
+        self.new_events = []
+        self.seen_counts = Counter()
+        self.new_counts = Counter()
+        self.stale_counts = Counter()
+        if os.path.exists(file_name):
+            try:
+                with open(file_name, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.error(f"Couldn't load {file_name}, starting a fresh index: {e}")
+        if any('item' not in entry for entry in self.entries.values()):
+            # fingerprints from before the time was part of them would never match again
+            logging.info(f"{file_name} predates per-item digests, starting a fresh index")
+            self.entries = {}
+
+    def get(self, site_name, fingerprint, config_digest=None, item_digest=None):
+        entry = self.entries.get(fingerprint)
+        if entry is None:
+            return None
+        if entry.get('config') != config_digest or entry.get('item') != item_digest:
+            # extracted under an older config or extractor, or the item was edited since: extract it again
+            self.stale_counts[site_name] += 1
+            return None
+        entry['last_seen'] = self.run_date
+        self.seen_counts[site_name] += 1
+        return dict(entry['event'])
+
+    def mark_seen(self, site_name, events):
+        # events reused without extraction still count as seen so they don't get pruned
+        for event in events:
+            entry = self.entries.get(event_key(site_name, event))
+            if entry is not None:
+                entry['last_seen'] = self.run_date
+                self.seen_counts[site_name] += 1
+
+    def add(self, site_name, fingerprint, event, config_digest=None, item_digest=None):
+        entry = self.entries.get(fingerprint)
+        if entry is not None:
+            # re-extracted after a config or item change, it isn't a new event
+            entry.update({"event": dict(event), "config": config_digest, "item": item_digest, "last_seen": self.run_date})
+            return
+        self.entries[fingerprint] = {"event": dict(event), "config": config_digest, "item": item_digest,
+                                     "first_seen": self.run_date, "last_seen": self.run_date}
+        self.new_events.append({**event, 'source': site_name})
+        self.new_counts[site_name] += 1
+
+    def save(self):
+        cutoff = (date.today() - timedelta(days=SEEN_EVENTS_MAX_AGE_DAYS)).isoformat()
+        self.entries = {fingerprint: entry for fingerprint, entry in self.entries.items() if entry['last_seen'] >= cutoff}
+        with atomic_write(self.file_name) as f:
+            json.dump(self.entries, f)
+
+def content_digest(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class PageCache:
+    # per-site digests of the last fetched page and content list, with the events extracted from them
+    def __init__(self, file_name=PAGE_CACHE_FILE):
+        self.file_name = file_name
+        self.entries = {}
+        self.pending = {}
+        self.status = {}
+        if os.path.exists(file_name):
+            try:
+                with open(file_name, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.error(f"Couldn't load {file_name}, starting a fresh page cache: {e}")
+
+    def current_entry(self, site_name, config):
+        # events cached under an older config are no use, the selectors that made them changed
+        entry = self.entries.get(site_name)
+        if entry and entry.get("config_digest") == get_extractor(config).config_digest:
+            return entry
+        return None
+
+    def unchanged_page(self, site_name, html_content, config):
+        # byte-identical page: no need to parse at all
+        page_digest = content_digest(html_content)
+        self.pending[site_name] = {"page_digest": page_digest, "config_digest": get_extractor(config).config_digest}
+        entry = self.current_entry(site_name, config)
+        if entry and entry.get("page_digest") == page_digest:
+            self.status[site_name] = "unchanged page"
+            return [dict(event) for event in entry["events"]]
+        return None
+
+    def unchanged_content_list(self, site_name, parsed_content, config):
+        # the page changed somewhere (nonces, ads, timestamps) but the event list didn't: skip extraction
+        extractor = get_extractor(config)
+        content_list = parsed_content.find(extractor.content_list_tag, extractor.content_list_attrs)
+        if content_list is None:
+            return None
+        list_digest = content_digest(str(content_list))
+        self.pending.setdefault(site_name, {})["list_digest"] = list_digest
+        entry = self.current_entry(site_name, config)
+        if entry and entry.get("list_digest") == list_digest:
+            self.status[site_name] = "unchanged content list"
+            self.update(site_name, entry["events"])
+            return [dict(event) for event in entry["events"]]
+        return None
+
+    def update(self, site_name, events):
+        self.status.setdefault(site_name, "changed")
+        self.entries[site_name] = {**self.pending.pop(site_name, {}), "events": events}
+
+    def save(self):
+        with atomic_write(self.file_name) as f:
+            json.dump(self.entries, f)
+
+def save_delta_events(new_events, filename=DELTA_EVENTS_FILE):
+    with atomic_write(filename) as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=EVENT_FIELDS + ['source'], extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(new_events)
  
 
 
 
+####################
+# DEDUPE
+####################
+
+# words that say nothing about which event it is, "Night Ranger Live In Concert" vs "Night Ranger @ Walker Theatre"
+TITLE_STOP_WORDS = {'a', 'an', 'and', 'at', 'in', 'of', 'on', 'the', 'with', 'live', 'concert', 'presents'}
+UNKNOWN_VALUES = {None, '', 'N/A', 'Open link for time'}
+
+def normalize_text(text):
+    text = re.sub(r"[^\w\s]", " ", str(text or '').lower().replace("’", "'").replace("'", ""))
+    return " ".join(text.split())
+
+def normalize_location(location):
+    if location in UNKNOWN_VALUES:
+        return ""
+    location = normalize_text(location)
+    return location[4:] if location.startswith("the ") else location
+
+def title_tokens(title, location_key):
+    # the venue is often repeated in the title on one site and not the other
+    location_words = set(location_key.split())
+    return [word for word in normalize_text(title).split() if word not in TITLE_STOP_WORDS and word not in location_words]
+
+def title_similarity(tokens, other_tokens):
+    if not tokens or not other_tokens:
+        return 0
+    # one title being the other plus extra words ("History Tour" / "History Tour - New Cave Adventure")
+    shared = len(set(tokens) & set(other_tokens))
+    containment = shared / min(len(set(tokens)), len(set(other_tokens))) if min(len(tokens), len(other_tokens)) >= 2 else 0
+    matcher = difflib.SequenceMatcher(None, " ".join(sorted(tokens)), " ".join(sorted(other_tokens)))
+    if containment < DEDUPE_TITLE_THRESHOLD and matcher.quick_ratio() < DEDUPE_TITLE_THRESHOLD:
+        return containment
+    return max(containment, matcher.ratio())
+
+def times_compatible(event, other):
+    return event.get('time') in UNKNOWN_VALUES or other.get('time') in UNKNOWN_VALUES or event.get('time') == other.get('time')
+
+def numbers_compatible(tokens, other_tokens):
+    # "Storytime (Ages 0-2)" / "(Ages 3-5)", "Vol 1" / "Vol 2" read as near-identical titles but aren't the same event
+    numbers = {token for token in tokens if token.isdigit()}
+    other_numbers = {token for token in other_tokens if token.isdigit()}
+    return not numbers or not other_numbers or numbers == other_numbers
+
+def same_listing(candidate, event, url, tokens):
+    if url not in UNKNOWN_VALUES and url in candidate['urls']:
+        return True
+    return (tokens == candidate['tokens'] and event.get('time') not in UNKNOWN_VALUES
+            and event.get('time') == candidate['event'].get('time'))
+
+class EventsDedupeWriter:
+    # candidates are blocked by (date, normalized location) so titles are only compared within a block,
+    # not all pairs. The first source in SITES order wins, missing fields are filled in from the others.
+    # Two events from the same site are only merged when they share a url, or they're the same listing posted
+    # twice (identical title and the same known time), otherwise a site's own listings are distinct events.
+    def __init__(self, file_name=DEDUPED_EVENTS_FILE):
+        self.file_name = file_name
+        self.site_events = {}
+
+    def write_site(self, site_name, events):
+        self.site_events[site_name] = events
+
+    def dedupe(self):
+        blocks = {}
+        canonical_events = []
+        for site_name in SITES:
+            for event in self.site_events.get(site_name, []):
+                location_key = normalize_location(event.get('location'))
+                tokens = title_tokens(event.get('title'), location_key)
+                block = blocks.setdefault((event.get('date'), location_key), [])
+                url = event.get('url')
+                for candidate in block:
+                    if site_name in candidate['sources'] and not same_listing(candidate, event, url, tokens):
+                        continue
+                    if (times_compatible(candidate['event'], event) and numbers_compatible(candidate['tokens'], tokens)
+                            and title_similarity(candidate['tokens'], tokens) >= DEDUPE_TITLE_THRESHOLD):
+                        merged = candidate['event']
+                        for field in EVENT_FIELDS:
+                            if merged.get(field) in UNKNOWN_VALUES and event.get(field) not in UNKNOWN_VALUES:
+                                merged[field] = event[field]
+                        if site_name not in candidate['sources']:
+                            candidate['sources'].append(site_name)
+                        candidate['urls'].add(url)
+                        break
+                else:
+                    candidate = {'event': dict(event), 'tokens': tokens, 'sources': [site_name], 'urls': {url}}
+                    block.append(candidate)
+                    canonical_events.append(candidate)
+        return [{**candidate['event'], 'sources': "; ".join(candidate['sources'])} for candidate in canonical_events]
+
+    def close(self):
+        events = self.dedupe()
+        total = sum(len(events) for events in self.site_events.values())
+        with atomic_write(self.file_name) as f:
+            writer = csv.DictWriter(f, fieldnames=EVENT_FIELDS + ['sources'], extrasaction='ignore', lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(events)
+        logging.info(f"Deduped {total} events to {len(events)} in {self.file_name}")
+
+    def abort(self):
+        self.site_events = {}
+
+
 ####################
 # EXECUTION
 ####################
 
+EVENT_DTYPES = {
+    'title': 'string',
+    'details': 'string',
+    'time': 'string',
+    'location': 'category',
+    'url': 'string',
+    'image_url': 'string',
+}
+
 def create_all_events_dataframe(all_events):
-    all_df = pd.DataFrame()
+    # fill each column in one pass and build the frame once, concatenating per site copied everything each time
+    columns = {field: [] for field in EVENT_FIELDS}
+    sources = []
     for site_name, events in all_events.items():
-        df = pd.DataFrame(events)
-        df['source'] = site_name
-        all_df = pd.concat([all_df, df], ignore_index=True)
+        for event in events:
+            for field, values in columns.items():
+                values.append(event.get(field))
+        sources.extend([site_name] * len(events))
+
+    all_df = pd.DataFrame(columns, columns=EVENT_FIELDS).astype(EVENT_DTYPES)
+    # dates are ISO strings, anything that didn't parse ("N/A") becomes NaT
+    all_df['date'] = pd.to_datetime(all_df['date'], format="%Y-%m-%d", errors='coerce')
+    all_df['source'] = pd.Categorical(sources, categories=list(all_events))
     return all_df
 
-def save_all_events_to_csv(all_df, filename="all_events.csv"):
-    all_df.to_csv(filename, index=False)
+def save_all_events_to_csv(all_df, filename=ALL_EVENTS_FILE):
+    # dates go back to ISO strings with "N/A" for NaT, same as the streaming writer and the per-site csvs
+    all_df = all_df.assign(date=all_df['date'].dt.strftime("%Y-%m-%d").fillna("N/A"))
+    with atomic_write(filename) as f:
+        all_df.to_csv(f, index=False)
+
+class EventsDataFrameWriter:
+    # the non-streaming path: hold every event and build one DataFrame at the end
+    def __init__(self, file_name=ALL_EVENTS_FILE):
+        self.file_name = file_name
+        self.site_events = {}
+
+    def write_site(self, site_name, events):
+        self.site_events[site_name] = events
+
+    def close(self):
+        # keep SITES order so the output matches a sequential run
+        all_events = {site_name: self.site_events[site_name] for site_name in SITES if site_name in self.site_events}
+        save_all_events_to_csv(create_all_events_dataframe(all_events), self.file_name)
+
+    def abort(self):
+        self.site_events = {}
+
+class EventsCsvWriter:
+    # each site goes to its own part file the moment it's extracted, so only one site's events are held at a time.
+    # close() stitches the parts together in SITES order and renames the result into place.
+    def __init__(self, file_name=ALL_EVENTS_FILE, site_names=None):
+        self.file_name = file_name
+        self.site_names = list(site_names if site_names is not None else SITES)
+        self.part_folder = file_name + '.parts'
+        self.counts = {}
+        os.makedirs(self.part_folder, exist_ok=True)
+
+    def part_file(self, site_name):
+        return os.path.join(self.part_folder, f"{site_name}.csv")
+
+    def write_site(self, site_name, events):
+        with atomic_write(self.part_file(site_name)) as f:
+            # same line endings as DataFrame.to_csv so the output doesn't depend on the mode
+            writer = csv.DictWriter(f, fieldnames=EVENT_FIELDS + ['source'], extrasaction='ignore', lineterminator='\n')
+            for event in events:
+                writer.writerow({**event, 'source': site_name})
+        self.counts[site_name] = len(events)
+
+    def close(self):
+        with atomic_write(self.file_name) as f:
+            csv.writer(f, lineterminator='\n').writerow(EVENT_FIELDS + ['source'])
+            for site_name in self.site_names:
+                if site_name not in self.counts:
+                    continue
+                with open(self.part_file(site_name), 'r', newline='', encoding='utf-8') as part:
+                    shutil.copyfileobj(part, f)
+        self.abort()
+        logging.info(f"Wrote {sum(self.counts.values())} events from {len(self.counts)} sites to {self.file_name}")
+
+    def abort(self):
+        shutil.rmtree(self.part_folder, ignore_errors=True)
+
+if pa is not None:
+    # source and month are the partition columns, they live in the folder names rather than the files
+    EVENT_SCHEMA = pa.schema([
+        ('title', pa.string()),
+        ('details', pa.string()),
+        ('date', pa.date32()),
+        ('time', pa.string()),
+        ('location', pa.dictionary(pa.int32(), pa.string())),
+        ('url', pa.string()),
+        ('image_url', pa.string()),
+        ('source', pa.string()),
+        ('month', pa.string()),
+    ])
+
+def events_to_arrow(site_name, events):
+    columns = {field: [event.get(field) for event in events] for field in EVENT_FIELDS}
+    # dates are ISO strings, "N/A" and the like become nulls
+    event_dates = []
+    for value in columns['date']:
+        try:
+            event_dates.append(date.fromisoformat(value))
+        except (TypeError, ValueError):
+            event_dates.append(None)
+    columns['date'] = event_dates
+    columns['source'] = [site_name] * len(events)
+    columns['month'] = [event_date.strftime("%Y-%m") if event_date else None for event_date in event_dates]
+    return pa.Table.from_pydict(columns, schema=EVENT_SCHEMA)
+
+class EventsParquetWriter:
+    # each site's partition is rewritten as soon as it's extracted, and swapped in with a rename.
+    # load everything with pd.read_parquet(PARQUET_FOLDER) or pyarrow.dataset.dataset(PARQUET_FOLDER, partitioning="hive")
+    def __init__(self, folder=PARQUET_FOLDER):
+        self.folder = folder
+        self.counts = {}
+        os.makedirs(folder, exist_ok=True)
+
+    def site_folder(self, folder, site_name):
+        # same escaping pyarrow uses for hive partition values
+        return os.path.join(folder, f"source={quote(site_name, safe='')}")
+
+    def write_site(self, site_name, events):
+        # dot-prefixed folders are skipped by dataset discovery, so readers never see a half written site
+        temp_folder = os.path.join(self.folder, f".{site_name}.tmp")
+        old_folder = os.path.join(self.folder, f".{site_name}.old")
+        shutil.rmtree(temp_folder, ignore_errors=True)
+        os.makedirs(temp_folder)
+        if events:
+            pq.write_to_dataset(events_to_arrow(site_name, events), temp_folder, partition_cols=['source', 'month'])
+
+        site_folder = self.site_folder(self.folder, site_name)
+        new_folder = self.site_folder(temp_folder, site_name)
+        if os.path.exists(site_folder):
+            os.replace(site_folder, old_folder)
+        if os.path.exists(new_folder):
+            os.replace(new_folder, site_folder)
+        shutil.rmtree(old_folder, ignore_errors=True)
+        shutil.rmtree(temp_folder, ignore_errors=True)
+        self.counts[site_name] = len(events)
+
+    def close(self):
+        logging.info(f"Wrote {sum(self.counts.values())} events from {len(self.counts)} sites to {self.folder}")
+
+    def abort(self):
+        for name in os.listdir(self.folder):
+            if name.startswith('.'):
+                shutil.rmtree(os.path.join(self.folder, name), ignore_errors=True)
+
+EVENTS_DB_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    fingerprint TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    title TEXT,
+    details TEXT,
+    date TEXT,
+    time TEXT,
+    location TEXT,
+    url TEXT,
+    image_url TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_date ON events (date);
+CREATE INDEX IF NOT EXISTS events_source_date ON events (source, date);
+CREATE INDEX IF NOT EXISTS events_location_date ON events (location, date);
+"""
+
+UPSERT_EVENT_SQL = """
+INSERT INTO events (fingerprint, source, title, details, date, time, location, url, image_url, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (fingerprint) DO UPDATE SET
+    title = excluded.title,
+    details = excluded.details,
+    time = excluded.time,
+    location = excluded.location,
+    image_url = excluded.image_url,
+    last_seen = excluded.last_seen
+"""
+
+def connect_events_db(db_file=EVENTS_DB_FILE):
+    connection = sqlite3.connect(db_file, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    # WAL so the dashboards can keep reading while a run writes
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(EVENTS_DB_SCHEMA)
+    if connection.execute("PRAGMA user_version").fetchone()[0] < 1:
+        # rows written before the time was part of the fingerprint, re-key them once
+        connection.execute("BEGIN")
+        rows = connection.execute("SELECT fingerprint, source, url, date, time, title FROM events").fetchall()
+        connection.executemany("UPDATE events SET fingerprint = ? WHERE fingerprint = ?",
+                               [(event_key(row['source'], dict(row)), row['fingerprint']) for row in rows])
+        connection.execute("PRAGMA user_version = 1")
+        connection.execute("COMMIT")
+    return connection
+
+class EventsSqliteWriter:
+    # upserts keyed on event_fingerprint, the whole run is one transaction so a failed run changes nothing
+    def __init__(self, db_file=EVENTS_DB_FILE):
+        self.db_file = db_file
+        self.run_date = date.today().isoformat()
+        self.counts = {}
+        self.connection = connect_events_db(db_file)
+        self.connection.execute("BEGIN")
+
+    def write_site(self, site_name, events):
+        rows = [
+            (event_key(site_name, event), site_name,
+             *(event.get(field) for field in EVENT_FIELDS), self.run_date, self.run_date)
+            for event in events
+        ]
+        self.connection.executemany(UPSERT_EVENT_SQL, rows)
+        self.counts[site_name] = len(rows)
+
+    def close(self):
+        self.connection.execute("COMMIT")
+        self.connection.close()
+        logging.info(f"Upserted {sum(self.counts.values())} events from {len(self.counts)} sites into {self.db_file}")
+
+    def abort(self):
+        self.connection.execute("ROLLBACK")
+        self.connection.close()
+
+def query_events(start_date, end_date=None, source=None, location=None, db_file=EVENTS_DB_FILE):
+    # e.g. this weekend: query_events("2024-08-24", "2024-08-25"), dates are ISO so ranges use the date index
+    sql = "SELECT * FROM events WHERE date >= ? AND date <= ?"
+    parameters = [str(start_date), str(end_date or start_date)]
+    if source:
+        sql += " AND source = ?"
+        parameters.append(source)
+    if location:
+        sql += " AND location = ?"
+        parameters.append(location)
+    sql += " ORDER BY date, source"
+    connection = connect_events_db(db_file)
+    try:
+        return [dict(row) for row in connection.execute(sql, parameters)]
+    finally:
+        connection.close()
+
+def build_outputs(db_file=EVENTS_DB_FILE, parquet_folder=PARQUET_FOLDER):
+    # None leaves the sqlite history / parquet dataset out (replays, unless --db / --parquet point them somewhere)
+    outputs = [EventsCsvWriter() if execute_stream_output else EventsDataFrameWriter()]
+    if execute_save_parquet and parquet_folder:
+        if pa is None:
+            logging.warning("pyarrow isn't installed, skipping the parquet output")
+        else:
+            outputs.append(EventsParquetWriter(parquet_folder))
+    if execute_save_sqlite and db_file:
+        outputs.append(EventsSqliteWriter(db_file))
+    if execute_dedupe:
+        outputs.append(EventsDedupeWriter())
+    return outputs
+
+def process_site(site_name, html_content, config, save_snapshot=True, seen_events=None, page_cache=None):
+    if not html_content:
+        logging.error(f"Failed to fetch or parse the content from {site_name}")
+        return None
+    if isinstance(html_content, BrowserRows):
+        return process_browser_rows(site_name, html_content, config, seen_events, page_cache)
+    if isinstance(html_content, JsonPayload):
+        return process_json(site_name, html_content, config, save_snapshot, seen_events, page_cache)
+
+    if page_cache is not None:
+        events = page_cache.unchanged_page(site_name, html_content, config)
+        if events is not None:
+            logging.info(f"{site_name} unchanged since the last run, reusing {len(events)} events")
+            if seen_events is not None:
+                seen_events.mark_seen(site_name, events)
+            return events
+
+    if execute_debugging:
+        logging.info("=" * 80)
+        if isinstance(html_content, ContentListHtml):
+            logging.info(f"{site_name}: only the content list was fetched, use \"fetch_scope\": \"page\" for grid_search / find_iframes")
+        else:
+            grid_search(html_content)
+            logging.info("=" * 80)
+            find_iframes(html_content)
+        logging.info("=" * 80)
+        # check_shadow_dom(session.driver)
+        # find_potential_containers(parsed_content)
+        if save_snapshot:
+            save_html(html_content, site_name)
+    parsed_content = parse_html(html_content, config)
+    if execute_save_html:
+        save_parsed(parsed_content, site_name)
+
+    if page_cache is not None:
+        events = page_cache.unchanged_content_list(site_name, parsed_content, config)
+        if events is not None:
+            logging.info(f"{site_name} content list unchanged since the last run, reusing {len(events)} events")
+            if seen_events is not None:
+                seen_events.mark_seen(site_name, events)
+            return events
+
+    events = extract_events(parsed_content, config, seen_events)
+    if page_cache is not None:
+        page_cache.update(site_name, events)
+
+    if execute_save_events_to_csv:
+        save_events_to_csv(events, site_name)
+
+    logging.info(f"Extracted {len(events)} events from {site_name}")
+    return events
+
+def process_structured(site_name, content, config, extract, seen_events=None, page_cache=None):
+    # browser rows and json feeds are already structured, there's no html to search or parse
+    if page_cache is not None:
+        events = page_cache.unchanged_page(site_name, json.dumps(content, sort_keys=True), config)
+        if events is not None:
+            logging.info(f"{site_name} unchanged since the last run, reusing {len(events)} events")
+            if seen_events is not None:
+                seen_events.mark_seen(site_name, events)
+            return events
+
+    events = extract()
+    if page_cache is not None:
+        page_cache.update(site_name, events)
+
+    if execute_save_events_to_csv:
+        save_events_to_csv(events, site_name)
+    return events
+
+def process_browser_rows(site_name, rows, config, seen_events=None, page_cache=None):
+    events = process_structured(site_name, rows, config, lambda: extract_browser_rows(rows, config, seen_events), seen_events, page_cache)
+    logging.info(f"Extracted {len(events)} events from {site_name} in the browser")
+    return events
+
+def process_json(site_name, payload, config, save_snapshot=True, seen_events=None, page_cache=None):
+    if execute_save_html and save_snapshot:
+        with atomic_write(os.path.join(LOG_FOLDER, f"{site_name}.json")) as f:
+            json.dump(payload.data, f)
+    events = process_structured(site_name, payload.data, config, lambda: extract_json_events(payload, config, seen_events), seen_events, page_cache)
+    logging.info(f"Extracted {len(events)} events from {site_name}'s json endpoint")
+    return events
 
-def main():
-    all_events = {}
+def scrape_sites(outputs, seen_events=None, page_cache=None):
+    pool_size = MAX_CONCURRENT_BROWSERS if execute_parallel_fetch else 1
+    run_start = time.perf_counter()
+
+    with BrowserPool(pool_size, build_chrome_options()) as pool:
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            futures = {}
+            for site_name, config in SITES.items():
+                logging.info(f"Queueing {site_name}")
+                futures[executor.submit(fetch_site, site_name, config, pool)] = site_name
+
+            # parse each site as soon as its fetch finishes
+            for future in as_completed(futures):
+                site_name = futures[future]
+                logging.info("#" * 80)
+                logging.info(f"Parsing {site_name}")
+                logging.info("#" * 80)
+                try:
+                    html_content = future.result()
+                except Exception as e:
+                    logging.error(f"Error fetching {site_name}: {e}")
+                    html_content = None
+
+                # one site's parse error shouldn't roll back every output
+                try:
+                    events = process_site(site_name, html_content, SITES[site_name], seen_events=seen_events, page_cache=page_cache)
+                except Exception:
+                    logging.exception(f"Error processing {site_name}")
+                    events = None
+                if events is None:
+                    continue
+                for output in outputs:
+                    output.write_site(site_name, events)
+
+        log_session_timings(pool, time.perf_counter() - run_start)
+
+def load_snapshot(replay_folder, site_name, config=None):
+    config = config or {}
+    json_file = os.path.join(replay_folder, f"{site_name}.json")
+    if config.get('fetch_mode') in ("json", "platform") and os.path.exists(json_file):
+        with open(json_file, 'r', encoding='utf-8') as f:
+            return JsonPayload(json.load(f))
+    file_name = os.path.join(replay_folder, f"{site_name}.html")
+    if not os.path.exists(file_name):
+        logging.error(f"No snapshot for {site_name} at {file_name}")
+        return None
+    with open(file_name, 'r', encoding='utf-8') as f:
+        html_content = f.read()
+    if config.get('fetch_mode') == "platform" and config['platform'].get('adapter') == "json_ld":
+        # json_ld reads the page itself, so the html snapshot is its fixture too
+        return JsonPayload({"events": json_ld_events(html_content)})
+    return html_content
+
+def replay_sites(replay_folder, outputs):
+    # run the parse/extract pipeline over saved snapshots, no browser and no network
+    run_start = time.perf_counter()
     for site_name, config in SITES.items():
-        url = config["url"]
         logging.info("#" * 80)
-        logging.info(f"Fetching and parsing {site_name}")
+        logging.info(f"Replaying {site_name} from {replay_folder}")
         logging.info("#" * 80)
-        html_content, driver = fetch_page(url)
-        if html_content:
-            if execute_debugging:
-                logging.info("=" * 80)
-                grid_search(html_content)
-                logging.info("=" * 80)
-                find_iframes(html_content)
-                logging.info("=" * 80)
-                # check_shadow_dom(driver)
-                # find_potential_containers(parsed_content)
-                # capture_network_requests(site_name, driver)
-                save_html(html_content, site_name)
-            parsed_content = parse_html(html_content)
-            if execute_save_html:
-                save_parsed(parsed_content, site_name)
-
-            events = extract_events(parsed_content, config)
-            all_events[site_name] = events
-
-            if execute_save_events_to_csv:
-                save_events_to_csv(events, site_name)
-
-            logging.info(f"Extracted {len(events)} events from {site_name}")
-            for event in events:
-                logging.info(f"Title: {event.get('title')}")
-                logging.info(f"Image URL: {event.get('image_url')}")
+        html_content = load_snapshot(replay_folder, site_name, config)
+        # don't write the snapshot back over itself
+        events = process_site(site_name, html_content, config, save_snapshot=False)
+        if events is None:
+            continue
+        for output in outputs:
+            output.write_site(site_name, events)
+    logging.info(f"Replay finished in {time.perf_counter() - run_start:.2f}s")
+
+def parse_args(argv=None):
+    arg_parser = argparse.ArgumentParser(description="Scrape Chattanooga event listings into all_events.csv")
+    arg_parser.add_argument("--replay", metavar="DIR",
+                            help="run extraction against saved <site>.html snapshots in DIR (e.g. logs) instead of fetching")
+    arg_parser.add_argument("--trace", action="store_true", help=f"write per-item trace records to {TRACE_FILE}")
+    arg_parser.add_argument("--capture-network", action="store_true",
+                            help="record xhr/fetch responses to logs/<site>_network.json and flag json event feeds")
+    arg_parser.add_argument("--full", action="store_true", help="re-extract every site and event instead of reusing results from earlier runs")
+    arg_parser.add_argument("--db", metavar="FILE",
+                            help=f"sqlite database for the event history, defaults to {EVENTS_DB_FILE} (replays only write one when given)")
+    arg_parser.add_argument("--parquet", metavar="DIR",
+                            help=f"folder for the parquet dataset, defaults to {PARQUET_FOLDER} (replays only write one when given)")
+    arg_parser.add_argument("--reference-date", type=date.fromisoformat, metavar="YYYY-MM-DD",
+                            help="date used to fill in missing years (e.g. when the snapshot was taken), defaults to today")
+    return arg_parser.parse_args(argv)
+
+RUN_STATS_FILE = os.path.join(LOG_FOLDER, 'run_stats.json')
+
+def collect_run_stats(seen_events=None, page_cache=None):
+    date_cache = parse_date_cached.cache_info()
+    stats = {
+        "date_cache": {
+            "hits": date_cache.hits,
+            "misses": date_cache.misses,
+            "size": date_cache.currsize,
+            "maxsize": date_cache.maxsize,
+        },
+        "date_paths": dict(DATE_PATH_COUNTS),
+    }
+    if page_cache is not None:
+        statuses = Counter(page_cache.status.values())
+        stats["page_cache"] = {
+            "sites": dict(page_cache.status),
+            "unchanged": statuses["unchanged page"] + statuses["unchanged content list"],
+            "changed": statuses["changed"],
+        }
+    if seen_events is not None:
+        stats["incremental"] = {
+            site_name: {"seen": seen_events.seen_counts[site_name], "new": seen_events.new_counts[site_name],
+                        "stale": seen_events.stale_counts[site_name]}
+            for site_name in SITES
+        }
+    return stats
+
+def log_run_summary(seen_events=None, page_cache=None):
+    stats = collect_run_stats(seen_events, page_cache)
+    logging.info("#" * 80)
+    date_cache = stats["date_cache"]
+    lookups = date_cache["hits"] + date_cache["misses"]
+    hit_rate = date_cache["hits"] / lookups if lookups else 0
+    logging.info(f"Date cache: {date_cache['hits']} hits, {date_cache['misses']} misses ({hit_rate:.0%}), {date_cache['size']} entries")
+    for path, count in sorted(stats["date_paths"].items()):
+        logging.info(f"Date parsed by {path}: {count}")
+    if "page_cache" in stats:
+        for site_name, status in stats["page_cache"]["sites"].items():
+            logging.info(f"{site_name}: {status}")
+        logging.info(f"Pages unchanged/skipped: {stats['page_cache']['unchanged']}, changed: {stats['page_cache']['changed']}")
+    for site_name, counts in stats.get("incremental", {}).items():
+        logging.info(f"{site_name}: {counts['new']} new, {counts['seen']} already seen, {counts['stale']} re-extracted (config or item changed)")
+    logging.info("#" * 80)
+    with open(RUN_STATS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, indent=2)
+
+def main(argv=None):
+    global REFERENCE_DATE, execute_capture_network
+    args = parse_args(argv)
+    if args.capture_network:
+        execute_capture_network = True
+    if args.reference_date:
+        REFERENCE_DATE = args.reference_date
+    if args.trace or execute_trace:
+        enable_trace()
+    compile_sites(SITES)
+    seen_events = None
+    page_cache = None
+    # replays are for tuning selectors, their events stay out of the event history and the dashboards' dataset
+    outputs = build_outputs(args.db or (None if args.replay else EVENTS_DB_FILE),
+                            args.parquet or (None if args.replay else PARQUET_FOLDER))
+    try:
+        if args.replay:
+            # replays always extract everything, they're for tuning selectors
+            replay_sites(args.replay, outputs)
+        else:
+            if execute_incremental and not args.full:
+                seen_events = SeenEventsIndex()
+            if execute_page_cache and not args.full:
+                page_cache = PageCache()
+            scrape_sites(outputs, seen_events, page_cache)
+    except BaseException:
+        # leave the last complete all_events.csv alone
+        for output in outputs:
+            output.abort()
+        raise
 
-                logging.info("-" * 40)
+    for output in outputs:
+        output.close()
 
-        else:
-            logging.error(f"Failed to fetch or parse the content from {site_name}")
+    if seen_events is not None:
+        save_delta_events(seen_events.new_events)
+        seen_events.save()
+    if page_cache is not None:
+        page_cache.save()
 
-    # Create a single dataframe with all events
-    all_events_df = create_all_events_dataframe(all_events)
-    
-    # Save the dataframe to a CSV file
-    save_all_events_to_csv(all_events_df)
+    log_run_summary(seen_events, page_cache)
 
 
 if __name__ == "__main__":
@@ -773,11 +2974,9 @@ if __name__ == "__main__":
 
 # TODO: display image link as an image instead of a url
 
-# TODO: fix capture network requests
-
 # TODO: refactor debugging calls
 
-# TODO: do i need the chromedriver install statements? should i setup a new env and kernel for this script? containerize it?
+# TODO: should i setup a new env and kernel for this script? containerize it?
 
 # BUG: script fails to establish connection (red herring?) when extracting shadow content on times free press
 
@@ -866,5 +3065,139 @@ if __name__ == "__main__":
         - attrs
         - tag
 - set up script for debugging image extraction
+---
+
+# 10-18-26
+- one browser session per run instead of one chrome launch per site
+    - BrowserSession opens chrome once, each site gets a fresh tab
+    - chromedriver path resolved once and cached in data/.chromedriver_path
+    - a cached driver that chrome rejects (after a chrome update) is dropped and resolved again, once
+    - dropped chromedriver_autoinstaller, webdriver_manager is enough
+    - startup and per-site fetch times logged at the end of the run
+- parallel fetching
+    - BrowserPool starts up to MAX_CONCURRENT_BROWSERS headless chromes on demand
+    - sites are fetched on a thread pool and parsed as soon as each one finishes
+    - results are put back in SITES order so all_events.csv doesn't change
+    - execute_parallel_fetch = False gives a pool of one (sequential)
+    - a browser that fails to start frees its slot, so waiting threads start their own or fail instead of hanging
+    - a browser that crashes mid-fetch is dropped from the pool the same way instead of being handed to the next site
+    - one site's parse error is logged and skipped, it no longer rolls back every output
+- replaced the fixed sleeps with wait_for_content
+    - polls for content_list_class / item_attr (as css) until the item count stops growing
+    - per-site "wait_timeout", defaults to DEFAULT_WAIT_TIMEOUT
+    - scroll_page no longer sleeps 0.1s per 100px, it waits once at the bottom
+- adaptive scrolling
+    - per-site "scroll_strategy": "none", "fixed" (old 100px steps) or "adaptive" (default)
+    - adaptive jumps a viewport at a time and stops after SCROLL_IDLE_ROUNDS rounds at the bottom with no new items or height
+    - rounds / items / time per site logged with the fetch timings
+- static http fetching
+    - per-site "fetch_mode": "browser" (default), "http" or "auto"
+    - auto tries a plain http get first and only opens a browser tab if content_list_class isn't in the html
+    - one pooled requests session (keep-alive, compressed) shared by all http fetches
+    - chrome is only started if some site actually needs it
+    - chatt library set to auto
+- offline replay: python event_scraper6.py --replay logs
+    - loads <site>.html snapshots and runs the normal parse/extract/csv pipeline
+    - snapshots aren't re-saved during a replay
+- offline benchmark: python debugging_scripts/benchmark.py --versions 2 3 4 5 6
+    - times parse_html, extract_events and each extract_* helper per site over the logs/ snapshots
+    - min / median / p95 and peak memory, json results in logs/benchmarks/
+- pluggable parser backend
+    - PARSER_BACKEND (default lxml) or per-site "parser": html.parser, lxml, html5lib, selectolax
+    - selectolax parses the page and hands just the content list to BeautifulSoup, so the extract_* helpers don't change
+    - missing backends fall back to lxml / html.parser with a warning
+- partial parsing
+    - parse_html only builds the content_list_class subtree (SoupStrainer), execute_partial_parse / per-site "partial_parse"
+    - falls back to a full parse if the strainer comes back empty
+- compiled extractors
+    - each SITES entry is compiled once into a SiteExtractor (__slots__) with resolved tag/attrs and bound parse functions
+    - unknown parse_method / extract_method or malformed selectors raise before any fetching starts
+    - extract_events is now a straight loop over extractor.extract, the old extract_* functions are thin wrappers
+    - date parsing split into one function per parse_method (DATE_PARSERS)
+- per-item logging moved out of the extraction hot path
+    - no more logging.info per field / tag dumps in web_scraper/date_extraction logs
+    - --trace (or execute_trace) writes compact per-item json records to logs/trace.jsonl
+    - trace calls sit behind an execute_trace check so they cost nothing when off
+- date parsing cache
+    - parse_date_cached: lru_cache (DATE_CACHE_SIZE) keyed on (parse_method, date_text)
+    - hits / misses logged at the end of the run and saved to logs/run_stats.json
+- date fast path
+    - per-site "formats" (strptime formats or regexes with month/day/year/time groups) tried before the fuzzy parse_method
+    - dates are now full ISO dates (YYYY-MM-DD), missing years filled in relative to today (--reference-date for replays)
+    - how often each format / fallback fired goes into the run summary (counted per date, cache hits included)
+    - "11-1pm" style ranges that cross noon give the start the opposite meridiem (11:00 AM, not PM)
+- incremental scraping
+    - data/seen_events.json maps a fingerprint (source + url + date + time + title) to the extracted event
+    - items already in the index skip details / location / image extraction and reuse the stored event
+    - index entries remember a digest of the site's config, after a config change they're extracted again (not counted as new)
+    - and a digest of the item's text (the raw row / json item for browser and json sites), an edited item is extracted again
+    - EXTRACTOR_VERSION is part of the config digest, bump it when parsing changes so stored events pick up the fix
+    - an index written before the item digests is dropped once, that run's delta lists everything like a first run
+    - new events are written to data/delta_events.csv next to the full all_events.csv
+    - entries not seen for SEEN_EVENTS_MAX_AGE_DAYS are pruned, --full ignores the index, replays never use it
+- unchanged page short circuit
+    - data/page_cache.json keeps a sha256 of each site's page and content list plus the events extracted from them
+    - entries also keep the site's config digest, a config change invalidates them
+    - identical page: skip parsing, identical content list: skip extraction, reuse last run's events either way
+    - per-site unchanged / changed status in the run summary
+- create_all_events_dataframe builds the frame once instead of a pd.concat per site
+    - explicit dtypes: date is datetime64, source and location are category, text columns are string
+    - no events still gives a frame (and csv header) with the usual columns
+- streaming output (execute_stream_output)
+    - each site's rows are written to all_events.csv.parts/<site>.csv as soon as it's extracted, nothing is kept for a DataFrame
+    - the parts are joined in SITES order at the end, same file as the DataFrame path
+    - the DataFrame path writes unparseable dates (NaT) back as "N/A" so the two really are the same file
+    - atomic_write: all_events.csv, per-site csvs, delta and the json indexes are written to .tmp and renamed into place
+- parquet output (execute_save_parquet, optional pyarrow)
+    - data/events_parquet/source=<site>/month=<YYYY-MM>/, date is a real date32, location is dictionary encoded
+    - partitioned by event month rather than day so a run doesn't scatter into hundreds of tiny files
+    - --replay leaves it alone like the sqlite store, --parquet DIR sends a replay to a scratch folder
+    - each site's partition is swapped in as soon as it's extracted, pd.read_parquet(PARQUET_FOLDER) loads the lot
+    - all outputs share write_site/close/abort, the DataFrame path is EventsDataFrameWriter
+- sqlite event store (execute_save_sqlite)
+    - data/events.db keeps history across runs, upserted on event_fingerprint with first_seen / last_seen
+    - indexes on date, (source, date) and (location, date), query_events(start, end, source, location) for lookups
+    - same fingerprint as the seen index (time included), rows from older databases are re-keyed once (PRAGMA user_version)
+    - one transaction per run, rolled back if the run fails
+    - --replay leaves it alone (snapshot events aren't history), --db FILE sends a replay to a scratch database instead
+- fetch_scope / DEFAULT_FETCH_SCOPE: the browser hands back just the content_list_class element's outerHTML
+    - one querySelector call with the config_to_css_selector selector, page_source if nothing matches
+    - selectors that drop callables are checked against the real config before being trusted
+    - content list snapshots go to logs/<site>_content_list.html, logs/<site>.html stays the full page replays and benchmarks use
+    - grid_search / find_iframes are skipped on a content list fetch, use "fetch_scope": "page" when hunting for new selectors
+- browser extraction engine ("extract_engine": "browser", DEFAULT_EXTRACT_ENGINE)
+    - compile_browser_spec turns the SITES selectors into css, EXTRACT_ITEMS_SCRIPT returns raw strings per item in one call
+    - SiteExtractor.extract_row runs them through the same date / url / image normalization as extract()
+    - sites with selectors css can't express (the pulse location lambda) stay on BeautifulSoup
+    - debugging_scripts/benchmark.py --browser times it against page_source + BeautifulSoup on the same page
+- shadow dom sites ("shadow": True)
+    - COMPOSED_HTML_SCRIPT serializes the flat tree (open shadow roots inlined, slots filled) in one call
+    - no more hopping host by host, the SITES selectors work on shadow content like any other page
+    - readiness wait and scrolling look inside shadow roots for these sites
+    - check_shadow_dom is one script call and also finds nested hosts
+    - Times Free Press config moved to the current SITES format (selectors still placeholders)
+- network capture fixed (--capture-network / execute_capture_network)
+    - performance logging turned on in the chrome options, each site's xhr/fetch responses and bodies (over CDP)
+      go to logs/<site>_network.json next to the html snapshot
+    - json bodies with a list of event-shaped objects are flagged along with their events_path
+- fetch_mode "json" with a "json_endpoint" (url, params, events_path, fields) reads the feed directly
+    - falls back to the browser and the html config if the endpoint fails
+    - feeds are saved as logs/<site>.json and replayed from there
+    - feed timestamps with an offset ("Z") are converted to LOCAL_TIMEZONE before the date and time are taken
+- platform adapters ("fetch_mode": "platform", "platform": {"adapter": ...})
+    - tribe_events: The Events Calendar REST api (wp-json/tribe/events/v1/events), follows next_rest_url
+    - simpleview: rest_v2 plugins_events_events_by_date with the public simple token
+    - webflow: CMS api v2 collection items, token from WEBFLOW_API_TOKEN (or "token_env")
+    - json_ld: schema.org Event objects embedded in the page, replays straight from the html snapshot
+    - feeds that fail or don't map (under half the items with a title and date) fall back to "fallback_fetch_mode"
+    - Chatt Library and Visit Chattanooga have their adapters configured but keep their html fetch_mode until a live run checks the feeds
+    - debugging_scripts/check_platform_adapters.py runs each adapter against debugging_scripts/fixtures/platforms/<adapter>.json offline
+- cross-source dedupe (execute_dedupe)
+    - events are blocked by (date, normalized location), titles only get compared inside a block
+    - difflib ratio or token containment over titles with stop words and the venue name removed
+    - different known times never merge, so separate showings stay separate
+    - titles with different numbers (ages 0-2 / 3-5, vol 1 / vol 2) never merge
+    - a site's own events only merge on the same url or an exact repost (same title and known time)
+    - all_events_deduped.csv has the canonical event plus a "sources" column
 
 '''
\ No newline at end of file